@@ -1,13 +1,19 @@
 """Main CLI entry point for the Codebase Summarizer tool."""
 
+import os
+import re
+import hashlib
 import typer
 import asyncio
+import logging
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict, Iterable
 
 from services.config import SemanticConfig
-from services.llm_client import llm_client
 from services.llm_usage_metrics import LLMProvider, AVAILABLE_MODELS
+from services.traversal_engine import TraversalEngine, SOURCE_FILES_PATTERN
 
 app = typer.Typer(
     name="semantic",
@@ -15,6 +21,76 @@ app = typer.Typer(
     add_completion=False,
 )
 
+# libuv-based event loop for the many concurrent LLM connections; optional and not on Windows
+HAS_UVLOOP = importlib.util.find_spec("uvloop") is not None
+
+def _available_cpus() -> int:
+    """Count the CPUs this process may run on, honoring affinity masks where supported."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# Directories are I/O-bound (file reads, LLM calls), so allow more jobs than cores
+DEFAULT_JOBS = min(32, _available_cpus() * 4)
+
+# LLM client for the current run; created by generate() once the provider and
+# model are resolved, so commands like init and hook install never import it
+llm_client = None
+
+# Bump whenever the directory summary prompt changes so stale fingerprints are ignored
+SUMMARY_PROMPT_VERSION = "2"
+
+# Shared summary instructions, followed by either a single directory or a group of small ones
+_SUMMARY_GUIDELINES = """You are an expert technical documentation generator that creates semantic summary files for AI coding agents.
+
+Your role is to generate a structured overview of a codebase directory for AI agents to understand and navigate effectively.
+
+Here is an example of the expected format:
+
+```markdown
+## Required Skillsets
+- Python
+- FastAPI
+- SQL
+
+## APIs
+### `user_service.py`
+class Authenticator (lines 10-100): Handles user authentication and authorization. 
+  - (lines 25-45) public getUserById(id: number) -> User: Fetches a user record from the database by their primary ID.
+  - (lines 58-70) public deleteUser(id: number) -> bool: Removes a user record from the database.
+```
+
+Requirements: 
+- Format APIs grouped by source file with proper markdown formatting
+- Include line numbers where applicable
+- Focus on APIs, classes, functions, and important interfaces
+- Identify required skillsets/technologies used
+- For each function and class, add a one or two sentence (MAX) description after writing the signature.
+
+"""
+
+# Per-directory summary prompt; the directory's fenced source files go between prefix and suffix
+SUMMARY_PROMPT_PREFIX = _SUMMARY_GUIDELINES + """Now generate the complete file content for the files in this directory:
+
+"""
+SUMMARY_PROMPT_SUFFIX = """
+
+Generate the complete overview now:"""
+
+# Directories whose sources fit this estimated token budget are summarized several
+# to a request, saving a round trip per small package
+SUMMARY_GROUP_TOKEN_BUDGET = 6000
+SUMMARY_GROUP_MAX_DIRECTORIES = 5
+
+SUMMARY_GROUP_PROMPT_PREFIX = _SUMMARY_GUIDELINES + """Each directory below starts with a <<<DIR path=...>>> line. Generate a separate overview for every directory, starting each one with its <<<DIR path=...>>> line exactly as given:
+"""
+SUMMARY_GROUP_PROMPT_SUFFIX = """
+
+Generate the complete overviews now:"""
+
+_GROUP_MARKER_RE = re.compile(r"^<<<DIR path=(.+?)>>>[ \t]*$", re.MULTILINE)
+
 
 @app.command()
 def generate(
@@ -40,7 +116,7 @@ def generate(
     force: bool = typer.Option(
         False,
         "--force",
-        help="Force regeneration of all summary files, even if they appear up-to-date.",
+        help="Force regeneration of all summary files, even if they appear up-to-date, calling the LLM again instead of reusing cached responses.",
     ),
     verbose: bool = typer.Option(
         False,
@@ -52,6 +128,33 @@ def generate(
         "--output-format",
         help="Output file format: agents or claude. Overrides .semanticsrc setting.",
     ),
+    jobs: int = typer.Option(
+        DEFAULT_JOBS,
+        "--jobs",
+        "-j",
+        "--max-concurrent",
+        min=1,
+        help="Maximum number of directories to process concurrently.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Bypass the on-disk LLM response cache.",
+    ),
+    requests_per_minute: Optional[float] = typer.Option(
+        None,
+        "--requests-per-minute",
+        "--rpm",
+        min=1,
+        help="Pace LLM requests to this many per minute. Overrides .semanticsrc setting.",
+    ),
+    tokens_per_minute: Optional[float] = typer.Option(
+        None,
+        "--tokens-per-minute",
+        "--tpm",
+        min=1,
+        help="Pace LLM requests to this many estimated input tokens per minute. Overrides .semanticsrc setting.",
+    ),
 ) -> None:
     """
     The primary command to perform a one-time scan and generation of semantic summary files.
@@ -60,30 +163,30 @@ def generate(
     - agents: Creates agents.md files (default)
     - claude: Creates claude.md files
     """
-    import logging
-    from services.traversal_engine import TraversalEngine
+    # Importing the orchestrator creates the shared LLM client, so it stays out of other commands
     from services.analysis_orchestrator import AnalysisOrchestrator
 
     target_path = path or Path.cwd()
     
-    # Configure logging
-    log_level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    # Configure logging, reducing noise from HTTP requests unless in verbose mode
+    _configure_logging(
+        logging.DEBUG if verbose else logging.INFO,
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        quiet_http=not verbose,
     )
     logger = logging.getLogger(__name__)
     
-    # Reduce noise from HTTP requests unless in verbose mode
-    if not verbose:
-        logging.getLogger("httpx").setLevel(logging.WARNING)
-        logging.getLogger("httpcore").setLevel(logging.WARNING)
-        logging.getLogger("openai").setLevel(logging.WARNING)
-    
-    logger.info(f"Generating semantic summaries for codebase at: {target_path}")
+    logger.info("Generating semantic summaries for codebase at: %s", target_path)
 
     if force:
         logger.info("Force regeneration enabled")
+        from services.llm_cache import llm_cache
+        # Regenerate from the LLM, but store the fresh responses for later runs
+        llm_cache.refresh = True
+
+    if no_cache:
+        from services.llm_cache import llm_cache
+        llm_cache.disabled = True
 
     # Load configuration
     config = SemanticConfig(target_path)
@@ -112,7 +215,7 @@ def generate(
 
     # Log provider inference for transparency
     if provider == "openai" and model is not None and llm_provider != LLMProvider.OPENAI:
-        logger.info(f"Inferred provider '{llm_provider.value}' from model '{model}'")
+        logger.info("Inferred provider '%s' from model '%s'", llm_provider.value, model)
 
     # Determine model (CLI > config > provider default)
     if model is None:
@@ -139,6 +242,15 @@ def generate(
     from services.llm_client import LLMClient
     global llm_client
     llm_client = LLMClient(provider=llm_provider, model=model)
+
+    # Rate limits: CLI > config > unlimited
+    requests_per_minute = requests_per_minute or config.get_llm_rate_limit('requests_per_minute')
+    tokens_per_minute = tokens_per_minute or config.get_llm_rate_limit('tokens_per_minute')
+    from services.rate_limiter import AsyncTokenBucket, AdaptiveConcurrencyLimiter
+    if requests_per_minute or tokens_per_minute:
+        llm_client.rate_limiter = AsyncTokenBucket(requests_per_minute, tokens_per_minute)
+    # Starts at --jobs and backs off when the provider answers with 429s
+    llm_client.concurrency_limiter = AdaptiveConcurrencyLimiter(jobs)
     
     try:
         # Initialize components
@@ -146,26 +258,31 @@ def generate(
         orchestrator = AnalysisOrchestrator()
 
         # Process directories in parallel with rate limiting
-        directories_processed = asyncio.run(_process_directories_async(
-            traversal_engine, orchestrator, logger, force, output_format, max_concurrent=15
+        directories_processed = _run_async(_process_directories_async(
+            traversal_engine, orchestrator, logger, force, output_format, max_concurrent=jobs
         ))
         
-        typer.echo(f"✓ Successfully processed {directories_processed} directories")
+        report = [f"✓ Successfully processed {directories_processed} directories"]
         
-        # Log final LLM usage summary
+        # Append final LLM usage summary and print the report in one write
         from services.llm_usage_metrics import llm_usage_collector
-        if llm_usage_collector._total_calls > 0:
+        if llm_usage_collector._total_calls > 0 or llm_usage_collector._cache_hits > 0:
             summary = llm_usage_collector.get_session_summary()
-            typer.echo(f"📊 LLM Usage Summary: {summary['total_calls']} calls, {summary['total_tokens']} tokens, ${summary['total_estimated_cost']:.4f} total cost")
+            report.append(
+                f"📊 LLM Usage Summary: {summary['total_calls']} calls, {summary['total_tokens']} tokens, "
+                f"${summary['total_estimated_cost']:.4f} total cost, "
+                f"{summary['cache_hits']} cache hits, {summary['cache_misses']} cache misses"
+            )
+        typer.echo("\n".join(report))
         
     except Exception as e:
-        logger.error(f"Error during generation: {e}")
+        logger.error("Error during generation: %s", e)
         typer.echo(f"✗ Generation failed: {e}", err=True)
         raise typer.Exit(1)
 
-async def _process_directories_async(traversal_engine, orchestrator, logger, force: bool, output_format: Optional[str] = None, max_concurrent: int = 5) -> int:
+async def _process_directories_async(traversal_engine, orchestrator, logger, force: bool, output_format: Optional[str] = None, max_concurrent: int = 5, summary_group_budget: int = SUMMARY_GROUP_TOKEN_BUDGET) -> int:
     """
-    Process directories asynchronously with semaphore-based rate limiting.
+    Process directories asynchronously with a bounded pool of workers.
 
     Args:
         traversal_engine: Engine to get directories to process
@@ -174,152 +291,453 @@ async def _process_directories_async(traversal_engine, orchestrator, logger, for
         force: Whether to force regeneration
         output_format: Output format override from CLI
         max_concurrent: Maximum number of concurrent LLM operations
+        summary_group_budget: Estimated token budget for summarizing small directories together (0 disables grouping)
 
     Returns:
         Number of directories processed
     """
-    semaphore = asyncio.Semaphore(max_concurrent)
+    # Seed with the root configuration the traversal engine has already loaded
+    configs = {traversal_engine.root_path: traversal_engine.config}
+
+    # Summary filename by config root: --output-format, else that root's config, else agents.md
+    output_filenames = {}
+
+    # With the Batch API, prompts are collected and submitted together after the scan
+    use_batch_api = traversal_engine.config.get_llm_batch_api() and llm_client.supports_batch_api()
+    pending_summaries = []
+
+    # Small directories wait here until enough of them fill a group request
+    pending_group = []
+    pending_group_tokens = 0
+
+    def _get_config(config_root: Path) -> SemanticConfig:
+        """Load the configuration for a root once per run; sibling directories share it."""
+        if config_root not in configs:
+            configs[config_root] = SemanticConfig(config_root)
+        return configs[config_root]
+
+    def _get_output_filename(config_root: Path, config: SemanticConfig) -> str:
+        """Resolve the summary filename once per config root."""
+        output_filename = output_filenames.get(config_root)
+        if output_filename is None:
+            effective_format = output_format or config.get_output_format()
+            output_filename = output_filenames[config_root] = config.format_to_filename(effective_format)
+        return output_filename
     
-    async def _process_single_directory(directory, output_format: Optional[str] = None):
-        """Process a single directory with semaphore protection."""
-        async with semaphore:
-            logger.info(f"Processing directory: {directory}")
+    def _scan_summary_sources(directory: Path, config: SemanticConfig, output_file: Path) -> List[Tuple[Path, os.stat_result]]:
+        """Scan a directory's source files, leaving out its own generated summary."""
+        return [
+            (file_path, stat) for file_path, stat in orchestrator._scan_source_files(directory, config)
+            if file_path.name != output_file.name
+        ]
+
+    def _plan_directory(directory: Path) -> Optional[Tuple[SemanticConfig, Path, Optional[List[Tuple[Path, os.stat_result]]]]]:
+        """
+        Resolve a directory's config, output file and, if the skip check scanned
+        them, its source files; None if the directory is up to date.
+        """
+        # Traversed directories always have an existing parent, so no exists() check is needed
+        config = _get_config(directory.parent)
+        output_filename = _get_output_filename(directory.parent, config)
+        output_file = directory / output_filename
+
+        # Skip if the output file is newer than every source file and force is not enabled;
+        # one stat both tells whether the summary exists and when it was written
+        scanned_files = None
+        if not force:
+            try:
+                summary_mtime_ns = os.stat(output_file).st_mtime_ns
+            except OSError:
+                summary_mtime_ns = None
+            if summary_mtime_ns is not None:
+                scanned_files = _scan_summary_sources(directory, config, output_file)
+                if _sources_unchanged_since(summary_mtime_ns, scanned_files):
+                    logger.info("Skipping %s: %s is up to date (use --force to regenerate)", directory, output_filename)
+                    return None
+        return config, output_file, scanned_files
+
+    # Summary files are written by background tasks so workers go straight on to the next LLM call
+    write_tasks = []
+
+    async def _write_summary(directory: Path, output_file: Path, content: str, message: str) -> bool:
+        """Write a summary file off the event loop, returning whether it succeeded."""
+        try:
+            await asyncio.to_thread(_write_output_file, output_file, content)
+        except OSError as e:
+            logger.error("Error writing %s: %s", output_file, e)
+            return False
+        logger.info(message, output_file.name, directory)
+        return True
+
+    def _save_summary(directory: Path, output_file: Path, fingerprint: str, prompt: str, content: str) -> None:
+        """Record a generated summary against the directory fingerprint and schedule its write."""
+        llm_client.record_summary(fingerprint, prompt)
+        write_tasks.append(asyncio.create_task(
+            _write_summary(directory, output_file, content, "Generated %s for %s")
+        ))
 
-            # Get output format from CLI option, config, or default
-            config = SemanticConfig(directory.parent if directory.parent.exists() else directory)
-            effective_format = output_format or config.get_output_format()
-            output_filename = config.format_to_filename(effective_format)
-            output_file = directory / output_filename
-
-            # Skip if output file exists and force is not enabled
-            if output_file.exists() and not force:
-                logger.info(f"Skipping {directory}: {output_filename} already exists (use --force to regenerate)")
-                return False
-
-            # Collect file contents from the directory
-            file_contents_str = ""
-
-            # Get all source files in the directory (non-recursive)
-            config = SemanticConfig(directory.parent if directory.parent.exists() else directory)
-            source_files = orchestrator._get_source_files(directory, config)
-            logger.debug(f"Found {len(source_files)} source files")
-
-            for file_path in source_files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_content = f.read()
-                        # Get file extension for syntax highlighting
-                        file_extension = file_path.suffix.lstrip('.')
-                        file_contents_str += f"\n### File: {file_path.name}\n"
-                        file_contents_str += f"```{file_extension}\n"
-                        file_contents_str += file_content
-                        file_contents_str += "\n```\n"
-                except (IOError, UnicodeDecodeError) as e:
-                    logger.warning(f"Could not read file {file_path}: {e}")
-                    file_contents_str += f"\n### File: {file_path.name}\n"
-                    file_contents_str += f"[Error reading file: {e}]\n"
-            
-            prompt = f"""You are an expert technical documentation generator that creates semantic summary files for AI coding agents.
+    async def _summarize_group(group: List[Tuple[Path, Path, str, str, str]]) -> None:
+        """Summarize a group of small directories in one request, falling back to single requests."""
+        summaries = [None] * len(group)
+        if len(group) > 1:
+            labels = [_relative_label(directory, traversal_engine.root_path) for directory, *_ in group]
+            group_prompt = _build_group_prompt(zip(labels, (contents for *_, contents in group)))
+            try:
+                response = await llm_client.summarize_group_async(group_prompt, len(group))
+                sections = _split_group_response(response)
+                summaries = [sections.get(label) for label in labels]
+            except Exception as e:
+                logger.warning("Grouped summary of %d directories failed, summarizing them one by one: %s", len(group), e)
 
-            Your role is to generate a structured overview of a codebase directory for AI agents to understand and navigate effectively.
+        for (directory, output_file, fingerprint, prompt, _), content in zip(group, summaries):
+            try:
+                if content:
+                    llm_client.store_summary(prompt, content)
+                else:
+                    content = await llm_client.summarize_async(prompt)
+                _save_summary(directory, output_file, fingerprint, prompt, content)
+            except Exception as e:
+                logger.error("Error processing directory %s: %s", directory, e)
+
+    def _add_to_pending_group(item: Tuple[Path, Path, str, str, str]) -> Optional[List[Tuple[Path, Path, str, str, str]]]:
+        """
+        Add a small directory to the pending group, returning a group that is
+        ready to summarize: the pending one if the item would push it over the
+        token budget, or the pending one with the item once it is full.
+        """
+        nonlocal pending_group, pending_group_tokens
+        tokens = len(item[-1]) // 4
+        ready = None
+        if pending_group and pending_group_tokens + tokens > summary_group_budget:
+            ready, pending_group, pending_group_tokens = pending_group, [], 0
+        pending_group.append(item)
+        pending_group_tokens += tokens
+        if ready is None and len(pending_group) == SUMMARY_GROUP_MAX_DIRECTORIES:
+            ready, pending_group, pending_group_tokens = pending_group, [], 0
+        return ready
+
+    async def _process_single_directory(
+        directory: Path,
+        config: SemanticConfig,
+        output_file: Path,
+        scanned_files: Optional[List[Tuple[Path, os.stat_result]]] = None
+    ) -> None:
+        """Process a single directory, reusing the planning scan when there was one."""
+        logger.info("Processing directory: %s", directory)
+
+        # Get all source files in the directory (non-recursive), scanning off the event loop
+        if scanned_files is None:
+            scanned_files = await asyncio.to_thread(_scan_summary_sources, directory, config, output_file)
+        source_files = [file_path for file_path, _ in scanned_files]
+        logger.debug("Found %d source files", len(source_files))
+
+        # Reuse the previous summary without reading files if no source changed
+        fingerprint = _directory_fingerprint(scanned_files, directory, traversal_engine.root_path)
+        cached_content = llm_client.get_unchanged_summary(fingerprint)
+        if cached_content is not None:
+            write_tasks.append(asyncio.create_task(
+                _write_summary(directory, output_file, cached_content, "Sources unchanged, reused %s for %s")
+            ))
+            return
+
+        # Read files in worker threads so other directories' LLM calls keep flowing
+        file_contents_str = await _collect_file_contents(source_files, logger)
+        
+        # One join copies the file contents once; chained + would copy them twice
+        prompt = "".join((SUMMARY_PROMPT_PREFIX, file_contents_str, SUMMARY_PROMPT_SUFFIX))
 
-            Here is an example of the expected format:
+        if use_batch_api:
+            pending_summaries.append((directory, output_file, fingerprint, prompt))
+            return
 
-            ```markdown
-            ## Required Skillsets
-            - Python
-            - FastAPI
-            - SQL
+        try:
+            if summary_group_budget and len(file_contents_str) // 4 <= summary_group_budget:
+                content = llm_client.lookup_summary(prompt)
+                if content is None:
+                    # Groups are summarized by the worker that fills them, so they don't wait for the whole scan
+                    group = _add_to_pending_group((directory, output_file, fingerprint, prompt, file_contents_str))
+                    if group is not None:
+                        await _summarize_group(group)
+                    return
+            else:
+                content = await llm_client.summarize_async(prompt)
 
-            ## APIs
-            ### `user_service.py`
-            class Authenticator (lines 10-100): Handles user authentication and authorization. 
-              - (lines 25-45) public getUserById(id: number) -> User: Fetches a user record from the database by their primary ID.
-              - (lines 58-70) public deleteUser(id: number) -> bool: Removes a user record from the database.
-            ```
+            _save_summary(directory, output_file, fingerprint, prompt, content)
+        except Exception as e:
+            logger.error("Error processing directory %s: %s", directory, e)
+    
+    # The tree is walked lazily while workers run, so LLM calls start with the first directory
+    directory_iterator = iter(traversal_engine.get_directories_to_process())
+    found = 0
+    queued = 0
+    completed = 0
+
+    def _next_planned_directory() -> Optional[Tuple[Path, SemanticConfig, Path, Optional[List[Tuple[Path, os.stat_result]]]]]:
+        """Advance the traversal to the next directory that needs generating, or None when done."""
+        nonlocal found
+        for directory in directory_iterator:
+            found += 1
+            plan = _plan_directory(directory)
+            if plan is not None:
+                return (directory, *plan)
+        return None
+
+    # Bounded so the producer stays only a little ahead of the workers
+    queue = asyncio.Queue(maxsize=max_concurrent * 2)
+
+    async def _producer():
+        """Feed planned directories to the workers, then one stop marker per worker."""
+        nonlocal queued
+        try:
+            # Traversal and skip checks touch the filesystem, so they run off the event loop
+            while (item := await asyncio.to_thread(_next_planned_directory)) is not None:
+                queued += 1
+                await queue.put(item)
+        finally:
+            for _ in range(max_concurrent):
+                await queue.put(None)
+        logger.info("Found %d directories, %d to generate", found, queued)
+
+    async def _worker():
+        """Process queued directories one at a time until the producer is done."""
+        nonlocal completed
+        while (item := await queue.get()) is not None:
+            directory, config, output_file, scanned_files = item
+            try:
+                await _process_single_directory(directory, config, output_file, scanned_files)
+            except Exception as e:
+                logger.error("Task failed: %s", e)
+            completed += 1
+            logger.debug("Progress: %d directories done", completed)
 
-            Requirements: 
-            - Format APIs grouped by source file with proper markdown formatting
-            - Include line numbers where applicable
-            - Focus on APIs, classes, functions, and important interfaces
-            - Identify required skillsets/technologies used
-            - For each function and class, add a one or two sentence (MAX) description after writing the signature.
+    try:
+        # Only max_concurrent workers exist at once, however many directories there are
+        await asyncio.gather(_producer(), *(_worker() for _ in range(max_concurrent)))
 
-            Now generate the complete file content for the files in this directory:
+        if pending_summaries:
+            logger.info("Submitting %d directory summaries to the Batch API", len(pending_summaries))
+            try:
+                summaries = await asyncio.to_thread(
+                    llm_client.summarize_as_batch, [prompt for _, _, _, prompt in pending_summaries]
+                )
+            except Exception as e:
+                logger.error("Batch API summarization failed: %s", e)
+                summaries = []
 
-            {file_contents_str}
+            for (directory, output_file, fingerprint, prompt), content in zip(pending_summaries, summaries):
+                if content is None:
+                    continue
+                _save_summary(directory, output_file, fingerprint, prompt, content)
 
-            Generate the complete overview now:"""
+        # Directories left over from the last, partly filled group
+        if pending_group:
+            await _summarize_group(pending_group)
 
-            try:
-                content = await llm_client.summarize_async(prompt)
+        # A directory counts as processed once its summary file is written
+        return sum(await asyncio.gather(*write_tasks))
+    finally:
+        # Pooled connections are bound to this event loop; close them before it is torn down
+        await llm_client.aclose()
 
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
 
-                logger.info(f"Generated {output_filename} for {directory}")
-                return True
-            except Exception as e:
-                logger.error(f"Error processing directory {directory}: {e}")
-                return False
-    
-    # Create tasks for all directories
-    directories = list(traversal_engine.get_directories_to_process())
-    tasks = [_process_single_directory(directory, output_format) for directory in directories]
-    
-    # Process tasks and count successful completions
-    directories_processed = 0
-    for completed_task in asyncio.as_completed(tasks):
-        try:
-            success = await completed_task
-            if success:
-                directories_processed += 1
-        except Exception as e:
-            logger.error(f"Task failed: {e}")
-    
-    return directories_processed
+def _sources_unchanged_since(mtime_ns: int, scanned_files: List[Tuple[Path, os.stat_result]]) -> bool:
+    """Check that no source file was modified after the given time, e.g. when its summary was written."""
+    return all(stat.st_mtime_ns <= mtime_ns for _, stat in scanned_files)
 
 
-def _resolve_model_alias(provider: LLMProvider, model: str) -> Optional[str]:
-    """Resolve model alias to full model name."""
-    provider_config = AVAILABLE_MODELS[provider]
+def _relative_label(directory: Path, root_path: Path) -> str:
+    """Name a directory by its path below the project root, for grouped prompts."""
+    try:
+        return directory.relative_to(root_path).as_posix() or "."
+    except ValueError:
+        return directory.as_posix()
 
-    # Check if it's already a valid full model name
-    if model in provider_config["models"]:
-        return model
 
-    # Check if it's an alias
-    aliases = provider_config.get("aliases", {})
-    if model in aliases:
-        return aliases[model]
+def _build_group_prompt(sections: Iterable[Tuple[str, str]]) -> str:
+    """Build the prompt summarizing several directories, one marked section per (label, contents)."""
+    parts = [SUMMARY_GROUP_PROMPT_PREFIX]
+    for label, contents in sections:
+        parts.extend(("\n<<<DIR path=", label, ">>>\n", contents))
+    parts.append(SUMMARY_GROUP_PROMPT_SUFFIX)
+    return "".join(parts)
 
-    return None
 
+def _split_group_response(response: str) -> Dict[str, str]:
+    """Split a grouped summary response into {label: summary} on its <<<DIR path=...>>> markers."""
+    pieces = _GROUP_MARKER_RE.split(response)
+    # re.split yields [preamble, label, body, label, body, ...]
+    return {label.strip(): body.strip() for label, body in zip(pieces[1::2], pieces[2::2])}
 
-def _infer_provider_from_model(model: str) -> Optional[LLMProvider]:
+
+def _run_async(coroutine):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    if HAS_UVLOOP:
+        import uvloop
+        return uvloop.run(coroutine)
+    return asyncio.run(coroutine)
+
+
+@lru_cache(maxsize=None)
+def _configure_logging(level: int, log_format: str, quiet_http: bool = False) -> None:
     """
-    Infer the LLM provider from a model name by checking all available models and aliases.
+    Configure root logging once per process for a given setup.
 
     Args:
-        model: The model name to analyze
+        level: Root logging level
+        log_format: Format string for the root handler
+        quiet_http: Reduce noise from HTTP client libraries to warnings
+    """
+    logging.basicConfig(level=level, format=log_format)
+
+    if quiet_http:
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        logging.getLogger("httpcore").setLevel(logging.WARNING)
+        logging.getLogger("openai").setLevel(logging.WARNING)
+
+
+def _read_prompt_file(file_path: Path) -> Tuple[Optional[str], Optional[Exception]]:
+    """Read one source file for the summary prompt, returning (content, error)."""
+    # Shares the orchestrator's per-file cap; imported here because importing the orchestrator
+    # loads the pydantic models and creates the global LLM client, which CLI startup avoids
+    from services.analysis_orchestrator import read_llm_input
+
+    try:
+        return read_llm_input(file_path), None
+    except IOError as e:
+        return None, e
+
+
+async def _collect_file_contents(source_files: List[Path], logger) -> str:
+    """
+    Read source files into the markdown block embedded in the summary prompt.
+
+    Files are read concurrently in worker threads, so collection takes about as
+    long as the slowest read and never blocks the event loop.
+
+    Args:
+        source_files: Source files of the directory
+        logger: Logger instance
 
     Returns:
-        The inferred LLMProvider, or None if no match found
+        The files' contents as fenced markdown sections, in source_files order
+    """
+    results = await asyncio.gather(*(asyncio.to_thread(_read_prompt_file, file_path) for file_path in source_files))
+    parts: List[str] = []
+
+    for file_path, (file_content, error) in zip(source_files, results):
+        name = file_path.name
+        if error is not None:
+            logger.warning("Could not read file %s: %s", file_path, error)
+            parts.append(f"\n### File: {name}\n[Error reading file: {error}]\n")
+            continue
+        # File extension for syntax highlighting; source files always have one
+        file_extension = name.rpartition('.')[2]
+        parts.extend(("\n### File: ", name, "\n```", file_extension, "\n", file_content, "\n```\n"))
+
+    return "".join(parts)
+
+
+def _directory_fingerprint(scanned_files: List[Tuple[Path, os.stat_result]], directory: Path, root_path: Path) -> str:
+    """
+    Fingerprint a directory's source files by name, modification time and size.
+
+    The fingerprint cache is shared across projects, so the digest also covers
+    the project root and the directory's path below it; otherwise directories
+    with identically named, sized and timestamped files would share a summary.
+
+    Args:
+        scanned_files: (file path, stat result) tuples from the directory scan, in a stable order
+        directory: Directory the files were scanned from
+        root_path: Root of the project being summarized
+
+    Returns:
+        Hex digest of the file states
+    """
+    digest = hashlib.blake2b(SUMMARY_PROMPT_VERSION.encode('utf-8'), digest_size=16)
+    digest.update(f"\0{root_path.resolve().as_posix()}\0{_relative_label(directory, root_path)}".encode('utf-8'))
+    for file_path, stat in scanned_files:
+        digest.update(f"\0{file_path.name}\0{stat.st_mtime_ns}\0{stat.st_size}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _write_output_file(output_file: Path, content: str) -> None:
+    """
+    Atomically replace a summary file with new content.
+
+    The content is encoded once and written with unbuffered os.write calls to a
+    temporary file next to the target, which is then renamed over it, so readers
+    never observe a partially written summary. A file that already holds the
+    same bytes is not rewritten, only touched, so it reads as newer than the
+    sources it was just generated from.
+
+    Args:
+        output_file: Path of the summary file to write
+        content: Summary text to store
     """
-    # Check each provider's models and aliases
+    data = content.encode('utf-8')
+
+    # Skip rewriting identical files, but bump the mtime so the freshness check skips them next run
+    try:
+        if os.stat(output_file).st_size == len(data) and output_file.read_bytes() == data:
+            os.utime(output_file)
+            return
+    except OSError:
+        pass
+
+    tmp_file = output_file.with_name(f".{output_file.name}.tmp")
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    try:
+        os.replace(tmp_file, output_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+def _build_model_index() -> Tuple[Dict[str, LLMProvider], Dict[Tuple[LLMProvider, str], str]]:
+    """
+    Index AVAILABLE_MODELS by model name and alias.
+
+    Returns:
+        Tuple of (name or alias -> provider, (provider, name or alias) -> full model name).
+        A name shared by several providers maps to the first in LLMProvider order.
+    """
+    model_to_provider = {}
+    resolved_models = {}
     for provider in LLMProvider:
-        provider_config = AVAILABLE_MODELS[provider]
+        for model in AVAILABLE_MODELS[provider]["models"]:
+            model_to_provider.setdefault(model, provider)
+            resolved_models[(provider, model)] = model
+        for alias, model in AVAILABLE_MODELS[provider].get("aliases", {}).items():
+            model_to_provider.setdefault(alias, provider)
+            resolved_models.setdefault((provider, alias), model)
+    return model_to_provider, resolved_models
 
-        # Check direct model name match
-        if model in provider_config["models"]:
-            return provider
 
-        # Check alias match
-        aliases = provider_config.get("aliases", {})
-        if model in aliases:
-            return provider
+_MODEL_TO_PROVIDER, _RESOLVED_MODELS = _build_model_index()
 
-    return None
+
+def _resolve_model_alias(provider: LLMProvider, model: str) -> Optional[str]:
+    """Resolve model alias to full model name."""
+    return _RESOLVED_MODELS.get((provider, model))
+
+
+def _infer_provider_from_model(model: str) -> Optional[LLMProvider]:
+    """
+    Infer the LLM provider from a model name by checking all available models and aliases.
+
+    Args:
+        model: The model name to analyze
+
+    Returns:
+        The inferred LLMProvider, or None if no match found
+    """
+    return _MODEL_TO_PROVIDER.get(model)
 
 
 @app.command()
@@ -358,6 +776,9 @@ def init(
         raise typer.Exit(1)
 
 
+# Matches an existing generate-summaries hook entry in .pre-commit-config.yaml
+_HOOK_ID_RE = re.compile(r'^\s*-?\s*id:\s*[\'"]?generate-summaries[\'"]?\s*$', re.MULTILINE)
+
 hook_app = typer.Typer(help="Hook management commands")
 app.add_typer(hook_app, name="hook")
 
@@ -373,10 +794,7 @@ def hook_install(
     """
     A helper command to install the summarizer into a Git pre-commit hook.
     """
-    import yaml
-    import logging
-    
-    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    _configure_logging(logging.INFO, '%(levelname)s: %(message)s')
     logger = logging.getLogger(__name__)
     
     if hook_type != "pre-commit":
@@ -384,6 +802,12 @@ def hook_install(
         raise typer.Exit(1)
     
     try:
+        import yaml
+
+        # Prefer the libyaml C bindings when PyYAML was built with them
+        SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
         # Path to .pre-commit-config.yaml
         config_path = Path.cwd() / ".pre-commit-config.yaml"
         
@@ -398,7 +822,7 @@ def hook_install(
                             "name": "Generate semantic summaries",
                             "entry": "semantic generate .",
                             "language": "system",
-                            "files": r"\.(py|js|go|ts|tsx|jsx|java|kt|scala|c|cpp|cc|cxx|h|hpp|rs|rb|php|cs|swift|r|R|sql|sh|bash|yaml|yml|json|toml|ini|cfg|md|rst)$",
+                            "files": SOURCE_FILES_PATTERN,
                             "stages": ["commit"]
                         }
                     ]
@@ -407,9 +831,16 @@ def hook_install(
         }
         
         if config_path.exists():
-            # Read existing configuration
             with open(config_path, 'r', encoding='utf-8') as f:
-                existing_config = yaml.safe_load(f) or {}
+                existing_text = f.read()
+
+            # Cheap textual check so re-running the command skips the YAML round-trip
+            if _HOOK_ID_RE.search(existing_text):
+                typer.echo("ℹ Pre-commit hook for semantic tool already exists")
+                return
+
+            # Read existing configuration
+            existing_config = yaml.load(existing_text, Loader=SafeLoader) or {}
             
             # Check if our hook already exists
             repos = existing_config.get('repos', [])
@@ -440,12 +871,12 @@ def hook_install(
                 
             # Write updated configuration
             with open(config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(existing_config, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(existing_config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
                 
         else:
             # Create new configuration file
             with open(config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(hook_config, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(hook_config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
         
         typer.echo(f"✓ Successfully installed pre-commit hook in {config_path}")
         typer.echo("To complete the installation, run:")
@@ -455,7 +886,7 @@ def hook_install(
         typer.echo("✗ PyYAML is required to install pre-commit hooks. Install it with: pip install PyYAML", err=True)
         raise typer.Exit(1)
     except Exception as e:
-        logger.error(f"Error installing hook: {e}")
+        logger.error("Error installing hook: %s", e)
         typer.echo(f"✗ Failed to install pre-commit hook: {e}", err=True)
         raise typer.Exit(1)
 
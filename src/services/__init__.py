@@ -1,11 +1,24 @@
 """Services module for the codebase summarizer."""
 
-from .analysis_orchestrator import AnalysisOrchestrator
-from .traversal_engine import TraversalEngine
-from .vcs_interface import VcsInterface
+import importlib
+
+# Exports are imported on first access so that importing any service module
+# (e.g. services.config for `semantic init`) does not load the LLM stack
+_LAZY_EXPORTS = {
+    'AnalysisOrchestrator': '.analysis_orchestrator',
+    'TraversalEngine': '.traversal_engine',
+    'VcsInterface': '.vcs_interface',
+}
 
 __all__ = [
     'AnalysisOrchestrator',
     'TraversalEngine',
     'VcsInterface'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
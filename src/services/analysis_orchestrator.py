@@ -1,9 +1,15 @@
 """Analysis orchestrator for managing language parsers and aggregating results."""
 
+import asyncio
+import codecs
 import logging
+import os
+from itertools import chain
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import List, Dict, Set
-from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 from models.data_models import DirectoryAnalysis, ApiInfo, AnalysisFragment
 from services.llm_client import llm_client
@@ -12,6 +18,74 @@ from services.config import SemanticConfig
 
 logger = logging.getLogger(__name__)
 
+# Source file extensions (comprehensive list)
+_SOURCE_EXTENSIONS = frozenset({
+    '.py', '.pyi',  # Python
+    '.js', '.jsx', '.ts', '.tsx', '.mjs',  # JavaScript/TypeScript
+    '.java', '.kt', '.scala',  # JVM languages
+    '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.hxx',  # C/C++
+    '.rs',  # Rust
+    '.go',  # Go
+    '.rb',  # Ruby
+    '.php',  # PHP
+    '.cs',  # C#
+    '.swift',  # Swift
+    '.m', '.mm',  # Objective-C
+    '.r', '.R',  # R
+    '.sql',  # SQL
+    '.sh', '.bash', '.zsh',  # Shell scripts
+    '.ps1',  # PowerShell
+    '.yaml', '.yml',  # YAML
+    '.json',  # JSON
+    '.toml',  # TOML
+    '.ini', '.cfg', '.conf',  # Configuration files
+    '.md', '.rst',  # Documentation
+})
+_SUPPORTED_EXTENSIONS_LIST = tuple(sorted(_SOURCE_EXTENSIONS))
+
+# Files larger than this are not sent to the LLM at all
+MAX_FILE_BYTES = 2_000_000
+
+# Generated lock files that match source extensions but carry no useful APIs
+# (.lock files such as yarn.lock never pass the extension check)
+_SKIP_BASENAMES = frozenset({
+    'package-lock.json', 'pnpm-lock.yaml',
+})
+
+# Only the first part of each file is sent to the LLM to bound tokens and memory
+MAX_LLM_INPUT_BYTES = 64 * 1024
+
+# Estimated token budget for packing several small files into one LLM request
+BATCH_TOKEN_BUDGET = 8000
+
+
+def read_llm_input(file_path: Path) -> str:
+    """
+    Read a source file for an LLM prompt, capped at MAX_LLM_INPUT_BYTES.
+
+    Args:
+        file_path: Path of the file to read
+
+    Returns:
+        The file content, annotated if it was truncated
+
+    Invalid UTF-8 is decoded with replacement characters rather than failing
+    the whole file.
+
+    Raises:
+        IOError: If the file cannot be read
+    """
+    # A bounded binary read, so bytes past the cap are never read or decoded
+    with open(file_path, 'rb') as f:
+        raw = f.read(MAX_LLM_INPUT_BYTES + 1)
+    if len(raw) <= MAX_LLM_INPUT_BYTES:
+        return raw.decode('utf-8', errors='replace')
+
+    logger.debug("Truncated %s to %d bytes for the LLM", file_path, MAX_LLM_INPUT_BYTES)
+    # A non-final incremental decode drops a character split by the cut
+    content = codecs.getincrementaldecoder('utf-8')(errors='replace').decode(raw[:MAX_LLM_INPUT_BYTES])
+    return content + "\n\n[TRUNCATED]"
+
 
 class AnalysisOrchestrator:
     """
@@ -21,7 +95,16 @@ class AnalysisOrchestrator:
 
     def __init__(self):
         """Initialize the orchestrator for LLM-based analysis."""
+        # Configurations by root, so sibling directories share one .semanticsrc load
+        self._configs: Dict[Path, SemanticConfig] = {}
         logger.debug("Initialized AnalysisOrchestrator with LLM-based analysis")
+
+    def _get_config(self, config_root: Path) -> SemanticConfig:
+        """Load the configuration for a root once per orchestrator."""
+        config = self._configs.get(config_root)
+        if config is None:
+            config = self._configs[config_root] = SemanticConfig(config_root)
+        return config
     
     def analyze_directory(self, directory_path: Path) -> DirectoryAnalysis:
         """
@@ -33,49 +116,111 @@ class AnalysisOrchestrator:
         Returns:
             DirectoryAnalysis containing aggregated results from all files
         """
-        logger.info(f"Analyzing directory: {directory_path}")
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._analyze_directory_in_own_loop(directory_path))
+        
+        # asyncio.run cannot nest inside a running event loop, so give the analysis its own thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._analyze_directory_in_own_loop(directory_path)).result()
+
+    async def _analyze_directory_in_own_loop(self, directory_path: Path) -> DirectoryAnalysis:
+        """Run one analysis on a loop of its own, closing the LLM connections before the loop ends."""
+        try:
+            return await self.analyze_directory_async(directory_path)
+        finally:
+            # Pooled connections are bound to this loop; a later call would fail on "Event loop is closed"
+            await llm_client.aclose()
+
+    async def analyze_directory_async(
+        self,
+        directory_path: Path,
+        max_concurrency: int = 16,
+        batch_token_budget: int = BATCH_TOKEN_BUDGET
+    ) -> DirectoryAnalysis:
+        """
+        Analyze all source files in a directory concurrently and aggregate results.
+
+        Per-file LLM requests are independent, so they are dispatched together
+        and bounded by a semaphore to stay within provider rate limits. Small
+        files are packed into shared requests to save per-request overhead.
+        
+        Args:
+            directory_path: Path to the directory to analyze
+            max_concurrency: Maximum number of in-flight LLM requests
+            batch_token_budget: Estimated token budget of a batched request (0 disables batching)
+            
+        Returns:
+            DirectoryAnalysis containing aggregated results from all files
+        """
+        logger.info("Analyzing directory: %s", directory_path)
         
         # Create config object for file-level exclusions
-        config = SemanticConfig(directory_path.parent if directory_path.parent.exists() else directory_path)
+        config = self._get_config(directory_path.parent if directory_path.parent.exists() else directory_path)
         
         # Get all source files in the directory (non-recursive)
-        source_files = self._get_source_files(directory_path, config)
-        logger.debug(f"Found {len(source_files)} source files")
+        scanned_files = self._scan_source_files(directory_path, config)
+        source_files = [file_path for file_path, _ in scanned_files]
+        logger.debug("Found %d source files", len(source_files))
         
-        # Analyze each file with comprehensive LLM analysis (single request per file)
-        analysis_fragments = []
-        file_type_counts = defaultdict(int)
+        file_type_counts = Counter(file_path.suffix.lower() for file_path in source_files)
+
+        analyses: Dict[Path, Tuple[List[ApiInfo], List[str]]] = {}
+        if llm_client.is_available():
+            # Files unchanged since their last analysis reuse it without being read
+            file_stats = dict(scanned_files)
+            pending_files = []
+            for file_path, stat in scanned_files:
+                unchanged = llm_client.get_unchanged_file_analysis(str(file_path), stat.st_mtime_ns, stat.st_size)
+                if unchanged is not None:
+                    analyses[file_path] = unchanged
+                else:
+                    pending_files.append(file_path)
+            if analyses:
+                logger.debug("Reusing analysis of %d unchanged files", len(analyses))
+
+            # Read off the event loop so file I/O overlaps with in-flight LLM requests
+            contents = await asyncio.gather(
+                *(asyncio.to_thread(self._read_source_file, file_path) for file_path in pending_files)
+            )
+            readable_files = [
+                (file_path, content)
+                for file_path, content in zip(pending_files, contents)
+                if content is not None
+            ]
+
+            if config.get_llm_batch_api() and llm_client.supports_batch_api():
+                new_analyses = await self._analyze_files_with_batch_api(readable_files)
+            else:
+                new_analyses = await self._analyze_files_interactive(readable_files, max_concurrency, batch_token_budget)
+            analyses.update(new_analyses)
+
+            # Stats were taken before reading, so a file modified mid-run is re-analyzed next time
+            for file_path, content in readable_files:
+                if file_path in new_analyses:
+                    llm_client.record_file_analysis(
+                        str(file_path), file_stats[file_path].st_mtime_ns, file_stats[file_path].st_size, content
+                    )
+
         all_llm_apis = []  # Store APIs from comprehensive LLM analysis
         all_llm_skillsets = []  # Store skillsets from comprehensive LLM analysis
-        
+
+        # Iterate in source_files order to keep output deterministic
         for file_path in source_files:
-            # Count file types
-            file_extension = file_path.suffix.lower()
-            file_type_counts[file_extension] += 1
-            
-            # Read file content for comprehensive LLM analysis
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    # Use LLM for comprehensive file analysis (APIs + skillsets in one request)
-                    if llm_client.is_available():
-                        logger.debug(f"Performing comprehensive analysis for {file_path}")
-                        llm_apis, llm_skillsets = llm_client.analyze_file_comprehensively(content, str(file_path))
-                        
-                        if llm_apis:
-                            all_llm_apis.extend(llm_apis)
-                            logger.info(f"✓ LLM extracted {len(llm_apis)} APIs from {file_path}")
-                        else:
-                            logger.warning(f"⚠ LLM returned 0 APIs from {file_path}")
-                            
-                        if llm_skillsets:
-                            all_llm_skillsets.extend(llm_skillsets)
-                            logger.info(f"✓ LLM extracted {len(llm_skillsets)} skillsets from {file_path}")
-            except (IOError, UnicodeDecodeError) as e:
-                logger.debug(f"Could not read file for analysis {file_path}: {e}")
-            
-            # Note: Parser-based analysis removed - using LLM analysis only
+            if file_path not in analyses:
+                continue
+
+            llm_apis, llm_skillsets = analyses[file_path]
+            if llm_apis:
+                all_llm_apis.extend(llm_apis)
+                logger.info("✓ LLM extracted %d APIs from %s", len(llm_apis), file_path)
+            else:
+                logger.warning("⚠ LLM returned 0 APIs from %s", file_path)
+                
+            if llm_skillsets:
+                all_llm_skillsets.extend(llm_skillsets)
+                logger.info("✓ LLM extracted %d skillsets from %s", len(llm_skillsets), file_path)
         
         # Aggregate results from LLM analysis only (parsers removed)
         return self._aggregate_analysis_results(
@@ -85,6 +230,143 @@ class AnalysisOrchestrator:
             all_llm_skillsets,  # Now comes from comprehensive per-file analysis
             all_llm_apis
         )
+
+    async def _analyze_files_interactive(
+        self,
+        files: List[Tuple[Path, str]],
+        max_concurrency: int,
+        batch_token_budget: int
+    ) -> Dict[Path, Tuple[List[ApiInfo], List[str]]]:
+        """
+        Analyze files with concurrent interactive LLM requests.
+        
+        Args:
+            files: List of (file_path, content) tuples
+            max_concurrency: Maximum number of in-flight LLM requests
+            batch_token_budget: Estimated token budget of a batched request
+            
+        Returns:
+            Dictionary mapping file path to (APIs, skillsets) for every analyzed file
+        """
+        analyses: Dict[Path, Tuple[List[ApiInfo], List[str]]] = {}
+        semaphore = asyncio.Semaphore(max_concurrency)
+        batches, singles = self._plan_batches(files, batch_token_budget)
+
+        async def _analyze_file(file_path: Path, content: str) -> Dict[Path, Tuple[List[ApiInfo], List[str]]]:
+            """Run comprehensive LLM analysis on one file (APIs + skillsets in one request)."""
+            async with semaphore:
+                logger.debug("Performing comprehensive analysis for %s", file_path)
+                return {file_path: await llm_client.analyze_file_comprehensively_async(content, str(file_path))}
+
+        async def _analyze_batch(batch: List[Tuple[Path, str]]) -> Dict[Path, Tuple[List[ApiInfo], List[str]]]:
+            """Run comprehensive LLM analysis on several small files in one request."""
+            async with semaphore:
+                logger.debug("Performing batched analysis for %d files", len(batch))
+                batch_results = await llm_client.analyze_files_batch_async(
+                    [(str(file_path), content) for file_path, content in batch]
+                )
+
+            results = {}
+            for file_path, content in batch:
+                if str(file_path) in batch_results:
+                    results[file_path] = batch_results[str(file_path)]
+                else:
+                    logger.debug("Batched response omitted %s, analyzing it individually", file_path)
+                    results.update(await _analyze_file(file_path, content))
+            return results
+
+        tasks = [_analyze_batch(batch) for batch in batches]
+        tasks.extend(_analyze_file(file_path, content) for file_path, content in singles)
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error("LLM analysis failed: %s", result)
+                continue
+            analyses.update(result)
+        return analyses
+
+    async def _analyze_files_with_batch_api(
+        self,
+        files: List[Tuple[Path, str]]
+    ) -> Dict[Path, Tuple[List[ApiInfo], List[str]]]:
+        """
+        Analyze files through the provider's Batch API.
+        
+        Args:
+            files: List of (file_path, content) tuples
+            
+        Returns:
+            Dictionary mapping file path to (APIs, skillsets) for every analyzed file
+        """
+        logger.info("Submitting %d files to the Batch API", len(files))
+        try:
+            batch_results = await asyncio.to_thread(
+                llm_client.analyze_files_as_batch,
+                [(str(file_path), content) for file_path, content in files]
+            )
+        except Exception as e:
+            logger.error("Batch API analysis failed: %s", e)
+            return {}
+        
+        return {
+            file_path: batch_results[str(file_path)]
+            for file_path, _ in files
+            if str(file_path) in batch_results
+        }
+
+    def _read_source_file(self, file_path: Path) -> Optional[str]:
+        """
+        Read a source file for LLM analysis, capped at MAX_LLM_INPUT_BYTES.
+        
+        Args:
+            file_path: Path of the file to read
+            
+        Returns:
+            The file content (annotated if truncated), or None if the file
+            cannot be read
+        """
+        try:
+            return read_llm_input(file_path)
+        except IOError as e:
+            logger.debug("Could not read file for analysis %s: %s", file_path, e)
+            return None
+    
+    def _plan_batches(
+        self,
+        files: List[Tuple[Path, str]],
+        token_budget: int
+    ) -> Tuple[List[List[Tuple[Path, str]]], List[Tuple[Path, str]]]:
+        """
+        Group small files into batches whose estimated token count fits the budget.
+        
+        Args:
+            files: List of (file_path, content) tuples
+            token_budget: Estimated token budget of a batched request
+            
+        Returns:
+            Tuple of (batches of two or more files, files to analyze on their own)
+        """
+        batches = []
+        singles = []
+        current: List[Tuple[Path, str]] = []
+        current_tokens = 0
+        
+        for file_path, content in files:
+            tokens = len(content) // 4  # Rough chars-per-token estimate
+            if tokens > token_budget:
+                singles.append((file_path, content))
+                continue
+            if current and current_tokens + tokens > token_budget:
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append((file_path, content))
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        
+        # A batch of one file gains nothing over the single-file request
+        singles.extend(batch[0] for batch in batches if len(batch) == 1)
+        return [batch for batch in batches if len(batch) > 1], singles
     
     def _get_source_files(self, directory_path: Path, config: SemanticConfig = None) -> List[Path]:
         """
@@ -97,48 +379,59 @@ class AnalysisOrchestrator:
         Returns:
             List of source file paths
         """
+        return [file_path for file_path, _ in self._scan_source_files(directory_path, config)]
+
+    def _scan_source_files(self, directory_path: Path, config: SemanticConfig = None) -> List[Tuple[Path, os.stat_result]]:
+        """
+        Get all source files in the directory with the stat results taken while scanning.
+
+        Callers use the stats for change detection instead of stat'ing each file again.
+
+        Args:
+            directory_path: Path to scan for source files
+            config: Optional configuration object for exclusions
+
+        Returns:
+            List of (file path, stat result) tuples, sorted by path
+        """
         source_files = []
-        
-        # Define source file extensions (comprehensive list)
-        source_extensions = {
-            '.py', '.pyi',  # Python
-            '.js', '.jsx', '.ts', '.tsx', '.mjs',  # JavaScript/TypeScript
-            '.java', '.kt', '.scala',  # JVM languages
-            '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.hxx',  # C/C++
-            '.rs',  # Rust
-            '.go',  # Go
-            '.rb',  # Ruby
-            '.php',  # PHP
-            '.cs',  # C#
-            '.swift',  # Swift
-            '.m', '.mm',  # Objective-C
-            '.r', '.R',  # R
-            '.sql',  # SQL
-            '.sh', '.bash', '.zsh',  # Shell scripts
-            '.ps1',  # PowerShell
-            '.yaml', '.yml',  # YAML
-            '.json',  # JSON
-            '.toml',  # TOML
-            '.ini', '.cfg', '.conf',  # Configuration files
-            '.md', '.rst',  # Documentation
-        }
+        should_exclude = config.should_exclude_path if config else None
         
         try:
-            for item in directory_path.iterdir():
-                if (item.is_file() and 
-                    item.suffix.lower() in source_extensions and
-                    not item.name.startswith('.')):  # Skip hidden files
+            # scandir exposes the entry type from the directory listing, so filtering needs no per-entry stat
+            with os.scandir(directory_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name[0] == '.':  # Skip hidden files
+                        continue
+                    
+                    dot_index = name.rfind('.')
+                    if dot_index < 0 or name[dot_index:].lower() not in _SOURCE_EXTENSIONS:
+                        continue
+                    
+                    if name in _SKIP_BASENAMES or not entry.is_file():
+                        continue
+                    
+                    # DirEntry caches its stat result, so the size check costs one syscall at most
+                    stat = entry.stat()
+                    size = stat.st_size
+                    if size > MAX_FILE_BYTES:
+                        logger.debug("Skipping %s: %d bytes exceeds the %d byte limit", entry.path, size, MAX_FILE_BYTES)
+                        continue
+                    
+                    item = Path(entry.path)
                     
                     # Check configuration-based exclusions if config is available
-                    if config and config.should_exclude_path(item):
-                        logger.debug(f"Excluding file {item} due to configuration")
+                    if should_exclude and should_exclude(item):
+                        logger.debug("Excluding file %s due to configuration", item)
                         continue
                         
-                    source_files.append(item)
+                    source_files.append((item, stat))
         except (PermissionError, OSError) as e:
-            logger.warning(f"Could not access directory {directory_path}: {e}")
+            logger.warning("Could not access directory %s: %s", directory_path, e)
         
-        return sorted(source_files)
+        source_files.sort(key=itemgetter(0))
+        return source_files
     
 
     
@@ -163,39 +456,32 @@ class AnalysisOrchestrator:
         Returns:
             Aggregated DirectoryAnalysis object
         """
-        all_apis = []
-        skillset_set: Set[str] = set()
+        # Skillsets from fragments are always collected for technology detection
+        skillset_set = set().union(*(fragment.skillsets for fragment in fragments))
         
         # Prioritize LLM APIs if available, fallback to parser APIs
         if llm_apis:
-            logger.info(f"✓ Using LLM-extracted APIs: {len(llm_apis)} APIs found")
-            all_apis.extend(llm_apis)
-            
-            # Still collect skillsets from fragments for technology detection
-            for fragment in fragments:
-                skillset_set.update(fragment.skillsets)
+            logger.info("✓ Using LLM-extracted APIs: %d APIs found", len(llm_apis))
+            all_apis = list(llm_apis)
         else:
-            logger.warning(f"⚠ LLM APIs empty or None (llm_apis={llm_apis}), using parser-extracted APIs as fallback")
-            # Aggregate data from all fragments (fallback behavior)
-            for fragment in fragments:
-                all_apis.extend(fragment.apis)
-                skillset_set.update(fragment.skillsets)
+            logger.warning("⚠ LLM APIs empty or None (llm_apis=%s), using parser-extracted APIs as fallback", llm_apis)
+            # Aggregate APIs from all fragments (fallback behavior)
+            all_apis = list(chain.from_iterable(fragment.apis for fragment in fragments))
         
         # Add LLM-generated skillsets if available
         if llm_skillsets:
             skillset_set.update(llm_skillsets)
-            logger.debug(f"Added LLM skillsets: {llm_skillsets}")
+            logger.debug("Added LLM skillsets: %s", llm_skillsets)
         
         # Sort APIs by source file and line number for consistent output
-        all_apis.sort(key=lambda api: (api.source_file, api.start_line))
+        all_apis.sort(key=attrgetter('source_file', 'start_line'))
         
         # Convert skillsets to sorted list
-        required_skillsets = sorted(list(skillset_set))
+        required_skillsets = sorted(skillset_set)
         
         logger.info(
-            f"Aggregated results: {len(all_apis)} APIs, "
-            f"{len(required_skillsets)} skillsets, "
-            f"{sum(file_type_counts.values())} files"
+            "Aggregated results: %d APIs, %d skillsets, %d files",
+            len(all_apis), len(required_skillsets), sum(file_type_counts.values())
         )
         
         return DirectoryAnalysis(
@@ -213,25 +499,4 @@ class AnalysisOrchestrator:
         Returns:
             List of supported file extensions
         """
-        return [
-            '.py', '.pyi',  # Python
-            '.js', '.jsx', '.ts', '.tsx', '.mjs',  # JavaScript/TypeScript
-            '.java', '.kt', '.scala',  # JVM languages
-            '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.hxx',  # C/C++
-            '.rs',  # Rust
-            '.go',  # Go
-            '.rb',  # Ruby
-            '.php',  # PHP
-            '.cs',  # C#
-            '.swift',  # Swift
-            '.m', '.mm',  # Objective-C
-            '.r', '.R',  # R
-            '.sql',  # SQL
-            '.sh', '.bash', '.zsh',  # Shell scripts
-            '.ps1',  # PowerShell
-            '.yaml', '.yml',  # YAML
-            '.json',  # JSON
-            '.toml',  # TOML
-            '.ini', '.cfg', '.conf',  # Configuration files
-            '.md', '.rst',  # Documentation
-        ]
\ No newline at end of file
+        return list(_SUPPORTED_EXTENSIONS_LIST)
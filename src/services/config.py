@@ -1,17 +1,15 @@
 """Configuration file handling for .semanticsrc files."""
 
-try:
-    import yaml
-    HAS_YAML = True
-except ImportError:
-    HAS_YAML = False
-
+import importlib.util
 from pathlib import Path
 from typing import List, Optional
 import logging
 
 from services.llm_usage_metrics import LLMProvider, AVAILABLE_MODELS
 
+# PyYAML is imported only when a .semanticsrc file is actually read or written
+HAS_YAML = importlib.util.find_spec("yaml") is not None
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +40,8 @@ class SemanticConfig:
             logger.warning("PyYAML not installed. Cannot load .semanticsrc file. Install with: pip install PyYAML")
             return
         
+        import yaml
+
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 self._config_data = yaml.safe_load(f) or {}
@@ -71,7 +71,7 @@ class SemanticConfig:
             else:
                 logger.warning(f"Skipping non-string exclude pattern: {pattern}")
         
-        logger.debug(f"Loaded {len(string_patterns)} exclude patterns")
+        logger.debug("Loaded %d exclude patterns", len(string_patterns))
         return string_patterns
     
     def should_exclude_path(self, path: Path) -> bool:
@@ -104,17 +104,17 @@ class SemanticConfig:
                 dir_pattern = pattern[:-1]
                 # Check if any parent directory matches the pattern
                 if dir_pattern in path_parts:
-                    logger.debug(f"Excluding {path} (matches directory pattern: {pattern})")
+                    logger.debug("Excluding %s (matches directory pattern: %s)", path, pattern)
                     return True
                 # Check if the path itself matches as a directory
                 if path.is_dir() and path.name == dir_pattern:
-                    logger.debug(f"Excluding {path} (matches directory pattern: {pattern})")
+                    logger.debug("Excluding %s (matches directory pattern: %s)", path, pattern)
                     return True
             else:
                 # Handle file patterns and simple glob patterns
                 import fnmatch
                 if fnmatch.fnmatch(path_str, pattern) or fnmatch.fnmatch(path.name, pattern):
-                    logger.debug(f"Excluding {path} (matches pattern: {pattern})")
+                    logger.debug("Excluding %s (matches pattern: %s)", path, pattern)
                     return True
         
         return False
@@ -180,6 +180,32 @@ class SemanticConfig:
             return aliases[model]
         return None
     
+    def get_llm_batch_api(self) -> bool:
+        """Check if bulk analysis should go through the provider's Batch API."""
+        batch_api = self._config_data.get('llm', {}).get('batch_api', False)
+        if not isinstance(batch_api, bool):
+            logger.warning(f"Invalid batch_api '{batch_api}' in config, using false")
+            return False
+        return batch_api
+
+    def get_llm_rate_limit(self, key: str) -> Optional[float]:
+        """
+        Get a per-minute rate limit from the llm section of the configuration.
+
+        Args:
+            key: Setting name ('requests_per_minute' or 'tokens_per_minute')
+
+        Returns:
+            The positive limit, or None if unset or invalid
+        """
+        limit = self._config_data.get('llm', {}).get(key)
+        if limit is None:
+            return None
+        if isinstance(limit, bool) or not isinstance(limit, (int, float)) or limit <= 0:
+            logger.warning(f"Invalid {key} '{limit}' in config, ignoring")
+            return None
+        return float(limit)
+    
     def create_example_config(self) -> str:
         """
         Create an example .semanticsrc configuration.
@@ -207,6 +233,7 @@ class SemanticConfig:
                     '.DS_Store'
                 ]
             }
+            import yaml
             return yaml.dump(example_config, default_flow_style=False, sort_keys=False)
         else:
             # Fallback to manual YAML creation if PyYAML is not available
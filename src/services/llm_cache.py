@@ -0,0 +1,186 @@
+"""Persistent exact-match cache for LLM responses."""
+
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "semantic" / "llm.sqlite"
+
+
+class LLMCache:
+    """
+    Exact-match cache for LLM responses, persisted in a SQLite database.
+
+    Entries are keyed by a SHA-256 digest of everything that influences the
+    response (model, prompt version, input content), so unchanged inputs
+    return instantly on re-runs. A manifest of file (mtime, size) states lets
+    callers find the cached response of an unchanged file without reading it.
+    Set SEMANTIC_NO_CACHE=1, or the disabled attribute, to bypass it; set the
+    refresh attribute to ignore existing entries while still storing new ones.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        """
+        Initialize the cache. The database is opened lazily on first use.
+
+        Args:
+            path: Location of the SQLite database file
+        """
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._failed = False
+        # Set by callers (e.g. --no-cache) to bypass the cache for this process only
+        self.disabled = False
+        # Set by callers (e.g. --force) to skip lookups but keep writing fresh responses
+        self.refresh = False
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the cache is enabled and usable."""
+        return not (self._failed or self.disabled) and os.getenv("SEMANTIC_NO_CACHE") != "1"
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from the parts that determine an LLM response.
+
+        Args:
+            parts: Strings such as model name, prompt version and content
+
+        Returns:
+            Hex SHA-256 digest of the NUL-joined parts
+        """
+        # Hash part by part so large prompts are not first copied into one joined string
+        digest = hashlib.sha256()
+        for index, part in enumerate(parts):
+            if index:
+                digest.update(b"\0")
+            digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS manifest ("
+                    "key TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, cache_key TEXT NOT NULL)"
+                )
+                conn.commit()
+                self._conn = conn
+                logger.debug("Opened LLM cache at %s", self.path)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Could not open LLM cache at %s, caching disabled: %s", self.path, e)
+                self._failed = True
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key built with make_key
+
+        Returns:
+            The cached value, or None on a miss, when caching is disabled or when refreshing
+        """
+        if not self.enabled or self.refresh:
+            return None
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.debug("LLM cache lookup failed: %s", e)
+                return None
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            key: Cache key built with make_key
+            value: Serialized response to store
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.debug("LLM cache write failed: %s", e)
+
+    def get_manifest_entry(self, key: str) -> Optional[Tuple[int, int, str]]:
+        """
+        Look up the file state recorded when a file was last analyzed.
+
+        Args:
+            key: Manifest key built with make_key
+
+        Returns:
+            Tuple of (mtime_ns, size, response cache key), or None if unknown or refreshing
+        """
+        if not self.enabled or self.refresh:
+            return None
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT mtime_ns, size, cache_key FROM manifest WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug("LLM cache manifest lookup failed: %s", e)
+                return None
+        return (row[0], row[1], row[2]) if row else None
+
+    def set_manifest_entry(self, key: str, mtime_ns: int, size: int, cache_key: str) -> None:
+        """
+        Record the file state an analysis was produced from.
+
+        Args:
+            key: Manifest key built with make_key
+            mtime_ns: File modification time in nanoseconds
+            size: File size in bytes
+            cache_key: Key of the cached response for the file content
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO manifest (key, mtime_ns, size, cache_key) VALUES (?, ?, ?, ?)",
+                    (key, mtime_ns, size, cache_key)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.debug("LLM cache manifest write failed: %s", e)
+
+
+# Global instance to be used across the application
+llm_cache = LLMCache()
@@ -1,18 +1,115 @@
 """LLM client service for generating skillsets and API descriptions."""
 
 import os
+import re
 import logging
 import json
+import random
+import time
 import asyncio
+from functools import cached_property, lru_cache
 from typing import List, Optional, Tuple, Dict, Any
 from pathlib import Path
 
+try:
+    from dotenv import load_dotenv
+    HAS_DOTENV = True
+except ImportError:
+    HAS_DOTENV = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from services.llm_usage_metrics import LLMProvider, llm_usage_collector, AVAILABLE_MODELS
+from services.llm_cache import llm_cache
+from services.providers import LLMProviderClient
 from models.data_models import ApiInfo, DirectoryAnalysis, AgentsMdContent, TocEntry
 
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the file analysis prompt changes so stale cache entries are ignored
+FILE_ANALYSIS_PROMPT_VERSION = "2"
+
+# Static analysis rubrics, sent as instructions separate from the per-file input
+# so providers can serve the shared prefix from their prompt cache
+FILE_ANALYSIS_INSTRUCTIONS = """Analyze the source file given as input and identify its public APIs and the skillsets required to work on it.
+
+Respond with JSON only, using this structure:
+{"apis": [{"name": "...", "semantic_description": "...", "start_line": 1, "end_line": 1}], "skillsets": ["..."]}"""
+
+BATCH_ANALYSIS_INSTRUCTIONS = """Analyze each source file given as input and identify its public APIs and the skillsets required to work on it.
+
+Respond with JSON only, keyed by each file path exactly as given, using this structure:
+{"files": {"<file path>": {"apis": [{"name": "...", "semantic_description": "...", "start_line": 1, "end_line": 1}], "skillsets": ["..."]}}}"""
+
+# Trailing whitespace never changes a summary, so it is ignored in summary cache keys
+_TRAILING_WHITESPACE_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+# Retry policy for transient provider errors: exponential backoff with jitter
+MAX_RETRY_ATTEMPTS = 6
+RETRY_MIN_WAIT = 1.0
+RETRY_MAX_WAIT = 30.0
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON text, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the Retry-After delay a provider attached to an HTTP error, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check if a provider error is an HTTP 429 rate-limit rejection."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    # google.api_core exceptions carry the HTTP status in `code`
+    return (status or getattr(error, "code", None)) == 429
+
+
+@lru_cache(maxsize=1)
+def _load_env_file() -> None:
+    """Load environment variables from .env file if it exists, without overriding existing ones."""
+    env_path = Path.cwd() / ".env"
+    if not env_path.exists():
+        logger.debug("No .env file found")
+        return
+
+    try:
+        if HAS_DOTENV:
+            load_dotenv(env_path, override=False)
+        else:
+            with open(env_path, 'r') as f:
+                lines = f.read().splitlines()
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                key, sep, value = line.partition('=')
+                if not sep:
+                    continue
+                value = value.strip()
+                if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+                    value = value[1:-1]
+                os.environ.setdefault(key.strip(), value)
+        logger.debug("Loaded environment variables from %s", env_path)
+    except Exception as e:
+        logger.debug("Could not load .env file: %s", e)
+
 
 class LLMClient:
     """
@@ -29,21 +126,36 @@ class LLMClient:
             provider: The LLM provider to use
             model: Specific model to use. If not provided, uses provider default.
         """
-        # Try to load .env file if it exists
-        self._load_env_file()
+        # Try to load .env file if it exists (only read once per process)
+        _load_env_file()
 
         self.provider = provider
         self.model = model or AVAILABLE_MODELS[provider]["default"]
 
+        # Optional AsyncTokenBucket pacing async requests to the provider's rate limits
+        self.rate_limiter = None
+
+        # Optional AdaptiveConcurrencyLimiter bounding async requests in flight, shrinking on 429s
+        self.concurrency_limiter = None
+
+        # Summary requests in flight by cache key, so identical concurrent prompts share one call
+        self._summaries_in_flight: Dict[str, asyncio.Task] = {}
+
         # Get provider-specific API key
         self.api_key = self._get_api_key_for_provider(provider)
 
         if not self.api_key:
-            logger.warning(f"No API key for {provider.value}. LLM features will be disabled.")
-            self._provider_client = None
-        else:
-            self._provider_client = self._create_provider_client(provider, self.api_key)
-            logger.info(f"LLM client initialized with {provider.value} using model {self.model}")
+            logger.warning("No API key for %s. LLM features will be disabled.", provider.value)
+
+    @cached_property
+    def _provider_client(self) -> Optional[LLMProviderClient]:
+        """Provider client, created on first use so constructing LLMClient stays cheap."""
+        if not self.api_key:
+            return None
+        provider_client = self._create_provider_client(self.provider, self.api_key)
+        if provider_client is not None:
+            logger.info("LLM client initialized with %s using model %s", self.provider.value, self.model)
+        return provider_client
 
     def _get_api_key_for_provider(self, provider: LLMProvider) -> Optional[str]:
         """Get the API key for the specified provider."""
@@ -74,40 +186,587 @@ class LLMClient:
                 logger.error("Google Generative AI library not installed. Install with: pip install google-generativeai")
                 return None
         else:
-            logger.error(f"Unknown provider: {provider}")
+            logger.error("Unknown provider: %s", provider)
             return None
     
-    def _load_env_file(self):
-        """Load environment variables from .env file if it exists."""
-        env_path = Path.cwd() / ".env"
-        if env_path.exists():
-            try:
-                with open(env_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            key = key.strip()
-                            value = value.strip().strip('"').strip("'")
-                            os.environ[key] = value
-                logger.debug(f"Loaded environment variables from {env_path}")
-            except Exception as e:
-                logger.debug(f"Could not load .env file: {e}")
-        else:
-            logger.debug("No .env file found")
-    
     def is_available(self) -> bool:
         """Check if LLM client is available for use."""
+        if not self.api_key:
+            return False
         return self._provider_client is not None and self._provider_client.is_available()
 
+    async def aclose(self) -> None:
+        """Close the provider's async connections; call before the current event loop ends."""
+        # Don't create a provider client just to close it
+        provider_client = self.__dict__.get("_provider_client")
+        if provider_client is not None:
+            await provider_client.aclose()
+
     def summarize(self, prompt: str) -> str:
-        return self._make_llm_request(prompt, 5000, "summary")
+        cache_key = self._summary_cache_key(prompt)
+        cached = self._get_cached_summary(cache_key)
+        if cached is not None:
+            return cached
+
+        summary = self._make_llm_request(prompt, 5000, "summary")
+        llm_cache.set(cache_key, summary)
+        return summary
 
     async def summarize_async(self, prompt: str) -> str:
         """Async version of summarize method."""
-        return await self._make_llm_request_async(prompt, 5000, "summary")
+        cache_key = self._summary_cache_key(prompt)
+        cached = self._get_cached_summary(cache_key)
+        if cached is not None:
+            return cached
+
+        # Directories with identical sources build identical prompts; join the request already running
+        task = self._summaries_in_flight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._request_summary_async(prompt, cache_key))
+            self._summaries_in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self._summaries_in_flight.pop(cache_key, None))
+        # Shielded so one caller being cancelled does not cancel the others' shared request
+        return await asyncio.shield(task)
+
+    async def _request_summary_async(self, prompt: str, cache_key: str) -> str:
+        """Request a summary from the provider and cache it."""
+        summary = await self._make_llm_request_async(prompt, 5000, "summary")
+        llm_cache.set(cache_key, summary)
+        return summary
+
+    async def summarize_group_async(self, prompt: str, directory_count: int) -> str:
+        """
+        Summarize several directories in one request.
+
+        The response is not cached as a whole; callers split it per directory
+        and store each part with store_summary.
+
+        Args:
+            prompt: Prompt holding every directory's sources
+            directory_count: Number of directories in the prompt
+
+        Returns:
+            The raw response containing all directory summaries
+        """
+        return await self._make_llm_request_async(prompt, self._combined_output_tokens(directory_count), "summary_group")
+
+    def _combined_output_tokens(self, item_count: int) -> int:
+        """
+        Output token budget for a request answering several items at once.
+
+        Each item gets the usual 5000 tokens, capped at the provider's limit for
+        one request; items cut off by the cap are missing from the response and
+        callers fall back to single requests for them.
+        """
+        ceiling = self._provider_client.max_output_tokens(self.model) if self.is_available() else None
+        budget = 5000 * item_count
+        return min(budget, ceiling) if ceiling else budget
+
+    def lookup_summary(self, prompt: str) -> Optional[str]:
+        """Return the cached summary for a summary prompt, or None on a miss."""
+        return self._get_cached_summary(self._summary_cache_key(prompt))
+
+    def store_summary(self, prompt: str, summary: str) -> None:
+        """Cache a summary produced for a prompt by other means, e.g. a grouped request."""
+        llm_cache.set(self._summary_cache_key(prompt), summary)
+
+    def get_unchanged_summary(self, fingerprint: str) -> Optional[str]:
+        """
+        Return the cached summary of a directory whose sources are unchanged.
+
+        Args:
+            fingerprint: Digest of the directory's source file states
+
+        Returns:
+            The summary generated for the same fingerprint, or None if unknown
+        """
+        summary_key = llm_cache.get(self._summary_fingerprint_key(fingerprint))
+        if summary_key is None:
+            return None
+        return self._get_cached_summary(summary_key)
+
+    def record_summary(self, fingerprint: str, prompt: str) -> None:
+        """
+        Remember which summary prompt a directory fingerprint produced.
+
+        Args:
+            fingerprint: Digest of the directory's source file states
+            prompt: The summary prompt built from those files
+        """
+        llm_cache.set(self._summary_fingerprint_key(fingerprint), self._summary_cache_key(prompt))
+
+    def _summary_fingerprint_key(self, fingerprint: str) -> str:
+        """Build the cache key mapping a directory fingerprint to its summary."""
+        return llm_cache.make_key(self.provider.value, self.model, "summary-fingerprint", fingerprint)
+
+    def _summary_cache_key(self, prompt: str) -> str:
+        """Build the response cache key for a summary prompt, ignoring trailing whitespace."""
+        normalized_prompt = _TRAILING_WHITESPACE_RE.sub("", prompt)
+        return llm_cache.make_key(self.provider.value, self.model, "summary", normalized_prompt)
+
+    def _get_cached_summary(self, cache_key: str) -> Optional[str]:
+        """Look up a cached summary, recording the hit or miss."""
+        if not llm_cache.enabled:
+            return None
+
+        cached = llm_cache.get(cache_key)
+        if cached is None:
+            llm_usage_collector.log_cache_miss("summary")
+        else:
+            llm_usage_collector.log_cache_hit("summary")
+        return cached
+
+    def summarize_as_batch(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Summarize many prompts through the provider's Batch API at reduced cost.
+
+        Blocks until the whole batch completes, which can take much longer than
+        interactive requests, so this is meant for bulk generation.
+
+        Args:
+            prompts: Summary prompts, one per directory
+
+        Returns:
+            Summaries in prompt order; None where the batch request failed
+
+        Raises:
+            Exception: If the client does not support the Batch API or the batch fails
+        """
+        if not self.supports_batch_api():
+            raise Exception("LLM client does not support the Batch API")
+
+        cache_keys = [self._summary_cache_key(prompt) for prompt in prompts]
+        summaries = [self._get_cached_summary(cache_key) for cache_key in cache_keys]
+        misses = {
+            f"summary-{index}": prompt
+            for index, (prompt, summary) in enumerate(zip(prompts, summaries))
+            if summary is None
+        }
+        if not misses:
+            return summaries
+
+        responses = self._provider_client.create_batch_completions(misses, self.model, 5000)
+        for custom_id in misses:
+            index = int(custom_id.rsplit("-", 1)[1])
+            response = responses.get(custom_id)
+            if response is None:
+                logger.warning("Batch API returned no result for summary %s", index)
+                continue
+
+            llm_usage_collector.log_usage(
+                provider=self.provider,
+                model=self.model,
+                input_tokens=response["input_tokens"],
+                output_tokens=response["output_tokens"],
+                operation_type="summary_batch_api"
+            )
+            llm_cache.set(cache_keys[index], response["text"])
+            summaries[index] = response["text"]
+        return summaries
+
+    def analyze_file_comprehensively(self, content: str, file_path: str) -> Tuple[List[ApiInfo], List[str]]:
+        """
+        Extract APIs and skillsets from a single file in one LLM request.
+
+        Args:
+            content: The source file content
+            file_path: Path of the file being analyzed
+
+        Returns:
+            Tuple of (APIs found in the file, skillsets identified)
+        """
+        cache_key = self._file_analysis_cache_key(content)
+        cached = self._get_cached_file_analysis(cache_key, file_path)
+        if cached is not None:
+            return cached
+
+        prompt = self._build_file_analysis_prompt(content, file_path)
+        response_text = self._make_llm_request(prompt, 5000, "file_analysis", instructions=FILE_ANALYSIS_INSTRUCTIONS)
+        result = self._parse_file_analysis(response_text, file_path)
+        self._store_file_analysis(cache_key, result)
+        return result
+
+    async def analyze_file_comprehensively_async(self, content: str, file_path: str) -> Tuple[List[ApiInfo], List[str]]:
+        """Async version of analyze_file_comprehensively method."""
+        cache_key = self._file_analysis_cache_key(content)
+        cached = self._get_cached_file_analysis(cache_key, file_path)
+        if cached is not None:
+            return cached
+
+        prompt = self._build_file_analysis_prompt(content, file_path)
+        response_text = await self._make_llm_request_async(
+            prompt, 5000, "file_analysis", instructions=FILE_ANALYSIS_INSTRUCTIONS
+        )
+        result = self._parse_file_analysis(response_text, file_path)
+        self._store_file_analysis(cache_key, result)
+        return result
+
+    def _file_analysis_cache_key(self, content: str) -> str:
+        """Build the response cache key for a file analysis request."""
+        return llm_cache.make_key(self.provider.value, self.model, FILE_ANALYSIS_PROMPT_VERSION, content)
+
+    def get_unchanged_file_analysis(
+        self, file_path: str, mtime_ns: int, size: int
+    ) -> Optional[Tuple[List[ApiInfo], List[str]]]:
+        """
+        Get the cached analysis of a file that has not changed since it was last analyzed.
+
+        Args:
+            file_path: Path of the file
+            mtime_ns: Current modification time of the file in nanoseconds
+            size: Current size of the file in bytes
+
+        Returns:
+            Tuple of (APIs, skillsets) if the file state matches the manifest, None otherwise
+        """
+        entry = llm_cache.get_manifest_entry(self._manifest_key(file_path))
+        if entry is None or entry[0] != mtime_ns or entry[1] != size:
+            return None
+        return self._get_cached_file_analysis(entry[2], file_path)
+
+    def record_file_analysis(self, file_path: str, mtime_ns: int, size: int, content: str) -> None:
+        """
+        Record the file state an analysis was produced from, for get_unchanged_file_analysis.
+
+        Args:
+            file_path: Path of the file
+            mtime_ns: Modification time of the file when it was read, in nanoseconds
+            size: Size of the file when it was read, in bytes
+            content: The content that was analyzed
+        """
+        llm_cache.set_manifest_entry(
+            self._manifest_key(file_path), mtime_ns, size, self._file_analysis_cache_key(content)
+        )
+
+    def _manifest_key(self, file_path: str) -> str:
+        """Build the manifest key of a file for the current model and prompt."""
+        return llm_cache.make_key(self.provider.value, self.model, FILE_ANALYSIS_PROMPT_VERSION, file_path)
+
+    def _get_cached_file_analysis(self, cache_key: str, file_path: str) -> Optional[Tuple[List[ApiInfo], List[str]]]:
+        """
+        Look up a cached file analysis.
+
+        Args:
+            cache_key: Key built by _file_analysis_cache_key
+            file_path: Path of the file being analyzed; cached APIs are re-attributed to it
+
+        Returns:
+            Tuple of (APIs, skillsets) on a cache hit, None otherwise
+        """
+        if not llm_cache.enabled:
+            return None
+
+        cached = llm_cache.get(cache_key)
+        if cached is None:
+            llm_usage_collector.log_cache_miss("file_analysis")
+            return None
+
+        try:
+            data = _json_loads(cached)
+            apis = [ApiInfo(**{**api, "source_file": file_path}) for api in data["apis"]]
+            skillsets = list(data["skillsets"])
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.debug("Ignoring corrupt cache entry for %s: %s", file_path, e)
+            llm_usage_collector.log_cache_miss("file_analysis")
+            return None
+
+        llm_usage_collector.log_cache_hit("file_analysis")
+        return apis, skillsets
+
+    def _store_file_analysis(self, cache_key: str, result: Tuple[List[ApiInfo], List[str]]) -> None:
+        """Store a file analysis result in the response cache."""
+        apis, skillsets = result
+        llm_cache.set(cache_key, json.dumps({
+            "apis": [api.model_dump() for api in apis],
+            "skillsets": skillsets
+        }))
+
+    def _build_file_analysis_prompt(self, content: str, file_path: str) -> str:
+        """Build the per-file input for comprehensive single-file analysis."""
+        return f"File: {file_path}\n\n{content}"
+
+    def _parse_file_analysis(self, response_text: str, file_path: str) -> Tuple[List[ApiInfo], List[str]]:
+        """
+        Parse the JSON response of a comprehensive file analysis.
+
+        Args:
+            response_text: Raw text returned by the LLM
+            file_path: Path of the analyzed file, used as the API source file
+
+        Returns:
+            Tuple of (APIs, skillsets); both empty if the response cannot be parsed
+        """
+        data = self._parse_json_response(response_text, file_path)
+        if data is None:
+            return [], []
+        return self._file_analysis_from_data(data, file_path)
+
+    def _parse_json_response(self, response_text: str, context: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a JSON object from an LLM response, tolerating markdown code fences.
+
+        Args:
+            response_text: Raw text returned by the LLM
+            context: Description of the request, used in log messages
+
+        Returns:
+            The parsed JSON object, or None if the response is not a JSON object
+        """
+        text = response_text.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text[text.find("{"):]
+
+        try:
+            data = _json_loads(text)
+        except ValueError as e:
+            logger.warning("Could not parse LLM analysis for %s: %s", context, e)
+            return None
+
+        if not isinstance(data, dict):
+            logger.warning("Unexpected LLM analysis format for %s", context)
+            return None
+        return data
+
+    def _file_analysis_from_data(self, data: Dict[str, Any], file_path: str) -> Tuple[List[ApiInfo], List[str]]:
+        """Build (APIs, skillsets) from the parsed JSON analysis of a single file."""
+        apis = []
+        for api in data.get("apis", []):
+            try:
+                apis.append(ApiInfo(
+                    name=api["name"],
+                    semantic_description=api.get("semantic_description", ""),
+                    source_file=file_path,
+                    start_line=int(api.get("start_line", 0)),
+                    end_line=int(api.get("end_line", 0))
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug("Skipping malformed API entry in %s: %s", file_path, e)
+
+        skillsets = [s for s in data.get("skillsets", []) if isinstance(s, str)]
+        return apis, skillsets
+
+    def analyze_files_batch(self, files: List[Tuple[str, str]]) -> Dict[str, Tuple[List[ApiInfo], List[str]]]:
+        """
+        Extract APIs and skillsets from several small files in one LLM request.
+
+        Args:
+            files: List of (file_path, content) tuples
+
+        Returns:
+            Dictionary mapping file path to (APIs, skillsets). Files the model
+            omitted from its response are missing from the dictionary.
+        """
+        results, misses = self._split_cached_files(files)
+        if len(misses) == 1:
+            file_path, content = misses[0]
+            results[file_path] = self.analyze_file_comprehensively(content, file_path)
+        elif misses:
+            prompt = self._build_batch_analysis_prompt(misses)
+            response_text = self._make_llm_request(
+                prompt, self._combined_output_tokens(len(misses)), "file_analysis_batch", instructions=BATCH_ANALYSIS_INSTRUCTIONS
+            )
+            results.update(self._parse_batch_analysis(response_text, misses))
+        return results
+
+    async def analyze_files_batch_async(self, files: List[Tuple[str, str]]) -> Dict[str, Tuple[List[ApiInfo], List[str]]]:
+        """Async version of analyze_files_batch method."""
+        results, misses = self._split_cached_files(files)
+        if len(misses) == 1:
+            file_path, content = misses[0]
+            results[file_path] = await self.analyze_file_comprehensively_async(content, file_path)
+        elif misses:
+            prompt = self._build_batch_analysis_prompt(misses)
+            response_text = await self._make_llm_request_async(
+                prompt, self._combined_output_tokens(len(misses)), "file_analysis_batch", instructions=BATCH_ANALYSIS_INSTRUCTIONS
+            )
+            results.update(self._parse_batch_analysis(response_text, misses))
+        return results
+
+    def supports_batch_api(self) -> bool:
+        """Check if the provider offers an asynchronous Batch API."""
+        return self.is_available() and hasattr(self._provider_client, "create_batch_completions")
+
+    def analyze_files_as_batch(self, files: List[Tuple[str, str]]) -> Dict[str, Tuple[List[ApiInfo], List[str]]]:
+        """
+        Analyze files through the provider's Batch API at reduced cost.
+
+        Blocks until the whole batch completes, which can take much longer than
+        interactive requests, so this is meant for bulk scans.
+
+        Args:
+            files: List of (file_path, content) tuples
+
+        Returns:
+            Dictionary mapping file path to (APIs, skillsets). Files whose
+            batch request failed are missing from the dictionary.
+
+        Raises:
+            Exception: If the client is not available or the batch fails
+        """
+        if not self.supports_batch_api():
+            raise Exception("LLM client does not support the Batch API")
+
+        results, misses = self._split_cached_files(files)
+        if not misses:
+            return results
+
+        prompts = {
+            f"file-{index}": self._build_file_analysis_prompt(content, file_path)
+            for index, (file_path, content) in enumerate(misses)
+        }
+        responses = self._provider_client.create_batch_completions(
+            prompts, self.model, 5000, instructions=FILE_ANALYSIS_INSTRUCTIONS
+        )
+
+        for index, (file_path, content) in enumerate(misses):
+            response = responses.get(f"file-{index}")
+            if response is None:
+                logger.warning("Batch API returned no result for %s", file_path)
+                continue
+
+            llm_usage_collector.log_usage(
+                provider=self.provider,
+                model=self.model,
+                input_tokens=response["input_tokens"],
+                output_tokens=response["output_tokens"],
+                operation_type="file_analysis_batch_api"
+            )
+            result = self._parse_file_analysis(response["text"], file_path)
+            self._store_file_analysis(self._file_analysis_cache_key(content), result)
+            results[file_path] = result
+        return results
+
+    def _split_cached_files(
+        self, files: List[Tuple[str, str]]
+    ) -> Tuple[Dict[str, Tuple[List[ApiInfo], List[str]]], List[Tuple[str, str]]]:
+        """Separate files with a cached analysis from those that still need an LLM request."""
+        results = {}
+        misses = []
+        for file_path, content in files:
+            cached = self._get_cached_file_analysis(self._file_analysis_cache_key(content), file_path)
+            if cached is not None:
+                results[file_path] = cached
+            else:
+                misses.append((file_path, content))
+        return results, misses
+
+    def _build_batch_analysis_prompt(self, files: List[Tuple[str, str]]) -> str:
+        """Build the input for analyzing several files in one request."""
+        return "\n".join(f"### FILE: {file_path}\n{content}" for file_path, content in files)
+
+    def _parse_batch_analysis(
+        self, response_text: str, files: List[Tuple[str, str]]
+    ) -> Dict[str, Tuple[List[ApiInfo], List[str]]]:
+        """
+        Parse the JSON response of a batched file analysis and cache each file's result.
+
+        Args:
+            response_text: Raw text returned by the LLM
+            files: The (file_path, content) tuples that were sent
+
+        Returns:
+            Dictionary mapping file path to (APIs, skillsets) for every file in the response
+        """
+        data = self._parse_json_response(response_text, f"batch of {len(files)} files")
+        file_entries = data.get("files") if data else None
+        if not isinstance(file_entries, dict):
+            return {}
+
+        results = {}
+        for file_path, content in files:
+            entry = file_entries.get(file_path)
+            if not isinstance(entry, dict):
+                continue
+            result = self._file_analysis_from_data(entry, file_path)
+            self._store_file_analysis(self._file_analysis_cache_key(content), result)
+            results[file_path] = result
+        return results
     
-    def _make_llm_request(self, prompt: str, max_output_tokens: int, operation_type: str, model: Optional[str] = None) -> str:
+    def _create_completion_with_retry(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        operation_type: str,
+        instructions: Optional[str]
+    ) -> Dict[str, Any]:
+        """Call the provider, retrying transient failures with exponential backoff."""
+        for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
+            try:
+                return self._provider_client.create_completion(
+                    prompt, model, max_output_tokens, instructions=instructions
+                )
+            except self._provider_client.RETRYABLE_EXCEPTIONS as e:
+                if attempt == MAX_RETRY_ATTEMPTS:
+                    raise
+                time.sleep(self._before_retry(operation_type, attempt, e))
+
+    async def _create_completion_with_retry_async(
+        self,
+        prompt: str,
+        model: str,
+        max_output_tokens: int,
+        operation_type: str,
+        instructions: Optional[str]
+    ) -> Dict[str, Any]:
+        """Async version of _create_completion_with_retry method."""
+        limiter = self.concurrency_limiter
+        for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
+            # The slot is held per attempt, so requests waiting out a backoff don't occupy one
+            epoch = await limiter.acquire() if limiter is not None else 0
+            rate_limited = False
+            succeeded = False
+            try:
+                response = await self._provider_client.create_completion_async(
+                    prompt, model, max_output_tokens, instructions=instructions
+                )
+                succeeded = True
+                return response
+            except self._provider_client.RETRYABLE_EXCEPTIONS as e:
+                rate_limited = _is_rate_limit_error(e)
+                if attempt == MAX_RETRY_ATTEMPTS:
+                    raise
+                delay = self._before_retry(operation_type, attempt, e)
+            finally:
+                # Non-retryable failures (e.g. 400/401) leave without counting as a success
+                if limiter is not None:
+                    limiter.release(epoch, rate_limited, succeeded)
+            await asyncio.sleep(delay)
+
+    def _before_retry(self, operation_type: str, attempt: int, error: Exception) -> float:
+        """
+        Record a retry and compute how long to wait before it.
+
+        Args:
+            operation_type: Type of operation for usage tracking
+            attempt: Number of the attempt that just failed (1-based)
+            error: The transient error that was raised
+
+        Returns:
+            Seconds to wait, drawn at random up to an exponentially growing cap,
+            or as long as the provider asked for in a Retry-After header
+        """
+        delay = random.uniform(RETRY_MIN_WAIT, min(RETRY_MAX_WAIT, RETRY_MIN_WAIT * 2 ** attempt))
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            # RETRY_MAX_WAIT only caps our own backoff; retrying before the server's delay just burns an attempt
+            delay = max(delay, retry_after)
+        llm_usage_collector.log_retry(operation_type)
+        logger.warning(
+            "LLM request (%s) failed on attempt %d/%d, retrying in %.1fs: %s",
+            operation_type, attempt, MAX_RETRY_ATTEMPTS, delay, error
+        )
+        return delay
+
+    def _make_llm_request(
+        self,
+        prompt: str,
+        max_output_tokens: int,
+        operation_type: str,
+        model: Optional[str] = None,
+        instructions: Optional[str] = None
+    ) -> str:
         """
         Centralized function to make LLM API requests using provider abstraction.
 
@@ -116,6 +775,8 @@ class LLMClient:
             max_output_tokens: Maximum number of tokens to generate
             operation_type: Type of operation for usage tracking
             model: The model to use (defaults to instance model)
+            instructions: Static instructions sent separately from the prompt so
+                the provider can cache the shared prefix
 
         Returns:
             The text response from the LLM
@@ -129,7 +790,9 @@ class LLMClient:
         model_to_use = model or self.model
 
         try:
-            response = self._provider_client.create_completion(prompt, model_to_use, max_output_tokens)
+            response = self._create_completion_with_retry(
+                prompt, model_to_use, max_output_tokens, operation_type, instructions
+            )
 
             # Track usage metrics
             llm_usage_collector.log_usage(
@@ -143,10 +806,17 @@ class LLMClient:
             return response["text"]
 
         except Exception as e:
-            logger.error(f"Error making LLM request ({operation_type}): {e}")
+            logger.error("Error making LLM request (%s): %s", operation_type, e)
             raise
     
-    async def _make_llm_request_async(self, prompt: str, max_output_tokens: int, operation_type: str, model: Optional[str] = None) -> str:
+    async def _make_llm_request_async(
+        self,
+        prompt: str,
+        max_output_tokens: int,
+        operation_type: str,
+        model: Optional[str] = None,
+        instructions: Optional[str] = None
+    ) -> str:
         """
         Async version of the centralized function to make LLM API requests.
 
@@ -155,6 +825,8 @@ class LLMClient:
             max_output_tokens: Maximum number of tokens to generate
             operation_type: Type of operation for usage tracking
             model: The model to use (defaults to instance model)
+            instructions: Static instructions sent separately from the prompt so
+                the provider can cache the shared prefix
 
         Returns:
             The text response from the LLM
@@ -167,28 +839,28 @@ class LLMClient:
 
         model_to_use = model or self.model
 
+        if self.rate_limiter is not None:
+            # Roughly 4 characters per token
+            await self.rate_limiter.acquire((len(prompt) + len(instructions or "")) // 4)
+
         try:
-            # Run the provider call in a thread pool to make it async
-            loop = asyncio.get_event_loop()
-
-            def _sync_request():
-                response = self._provider_client.create_completion(prompt, model_to_use, max_output_tokens)
-
-                # Track usage metrics
-                llm_usage_collector.log_usage(
-                    provider=self.provider,
-                    model=model_to_use,
-                    input_tokens=response["input_tokens"],
-                    output_tokens=response["output_tokens"],
-                    operation_type=operation_type
-                )
+            response = await self._create_completion_with_retry_async(
+                prompt, model_to_use, max_output_tokens, operation_type, instructions
+            )
 
-                return response["text"]
+            # Track usage metrics
+            llm_usage_collector.log_usage(
+                provider=self.provider,
+                model=model_to_use,
+                input_tokens=response["input_tokens"],
+                output_tokens=response["output_tokens"],
+                operation_type=operation_type
+            )
 
-            return await loop.run_in_executor(None, _sync_request)
+            return response["text"]
 
         except Exception as e:
-            logger.error(f"Error making async LLM request ({operation_type}): {e}")
+            logger.error("Error making async LLM request (%s): %s", operation_type, e)
             raise
 
 # Global instance to be used across the application  
@@ -102,6 +102,9 @@ class LLMUsageCollector:
         self._total_calls = 0
         self._total_input_tokens = 0
         self._total_output_tokens = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._total_retries = 0
         logger.info("LLM Usage Collector initialized")
     
     def estimate_cost(
@@ -185,6 +188,36 @@ class LLMUsageCollector:
         
         return metrics
     
+    def log_retry(self, operation_type: str) -> None:
+        """
+        Record a retried LLM call after a transient failure.
+        
+        Args:
+            operation_type: Type of operation (e.g., "file_analysis")
+        """
+        self._total_retries += 1
+        logger.debug("LLM retry (%s) | Total retries: %d", operation_type, self._total_retries)
+    
+    def log_cache_hit(self, operation_type: str) -> None:
+        """
+        Record an LLM call that was served from the response cache.
+        
+        Args:
+            operation_type: Type of operation (e.g., "file_analysis")
+        """
+        self._cache_hits += 1
+        logger.debug("LLM cache hit (%s) | Hits: %d, misses: %d", operation_type, self._cache_hits, self._cache_misses)
+    
+    def log_cache_miss(self, operation_type: str) -> None:
+        """
+        Record an LLM call that was not found in the response cache.
+        
+        Args:
+            operation_type: Type of operation (e.g., "file_analysis")
+        """
+        self._cache_misses += 1
+        logger.debug("LLM cache miss (%s) | Hits: %d, misses: %d", operation_type, self._cache_hits, self._cache_misses)
+    
     def get_session_summary(self) -> Dict[str, Any]:
         """
         Get a summary of all LLM usage in the current session.
@@ -198,6 +231,9 @@ class LLMUsageCollector:
             "total_output_tokens": self._total_output_tokens,
             "total_tokens": self._total_input_tokens + self._total_output_tokens,
             "total_estimated_cost": self._total_cost,
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "total_retries": self._total_retries,
             "average_cost_per_call": self._total_cost / self._total_calls if self._total_calls > 0 else 0.0
         }
     
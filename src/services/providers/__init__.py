@@ -1,15 +1,53 @@
 """Provider abstraction layer for LLM services."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple, Type
 
 
 class LLMProviderClient(ABC):
     """Abstract base class for LLM provider clients."""
 
+    # Transient errors (rate limits, timeouts, dropped connections) worth retrying
+    RETRYABLE_EXCEPTIONS: Tuple[Type[BaseException], ...] = ()
+
     @abstractmethod
-    def create_completion(self, prompt: str, model: str, max_tokens: int) -> Dict[str, Any]:
-        """Create a completion using provider-specific API."""
+    def create_completion(
+        self, prompt: str, model: str, max_tokens: int, instructions: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a completion using provider-specific API.
+
+        Static instructions are passed separately from the per-call prompt so
+        providers can reuse their cached prefix across requests.
+        """
+        pass
+
+    async def create_completion_async(
+        self, prompt: str, model: str, max_tokens: int, instructions: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of create_completion.
+
+        Providers without a native async client run the sync call in a worker thread.
+        """
+        return await asyncio.to_thread(self.create_completion, prompt, model, max_tokens, instructions)
+
+    def max_output_tokens(self, model: str) -> Optional[int]:
+        """
+        Largest max_tokens a single non-streaming request to the model accepts,
+        or None if the provider imposes no client-side ceiling.
+        """
+        return None
+
+    async def aclose(self) -> None:
+        """
+        Close the connections held by the async client.
+
+        Pooled connections are bound to the event loop that opened them, so
+        callers close them before that loop ends; the next async call on
+        another loop opens a fresh pool.
+        """
         pass
 
     @abstractmethod
@@ -1,23 +1,62 @@
 """Anthropic provider implementation."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import anthropic
 from . import LLMProviderClient
 
 
+# The SDK rejects non-streaming requests that could run past 10 minutes: about
+# 21.3k output tokens in general and 8192 for the models it lists as slower
+MAX_NONSTREAMING_OUTPUT_TOKENS = 21_333
+SLOW_MODEL_NONSTREAMING_OUTPUT_TOKENS = {
+    "claude-opus-4-20250514": 8192,
+    "claude-4-opus-20250514": 8192,
+    "claude-opus-4-0": 8192,
+    "claude-opus-4-1-20250805": 8192,
+    "claude-opus-4-1": 8192,
+}
+
+
 class AnthropicProvider(LLMProviderClient):
     """Anthropic provider client implementation."""
 
+    # APIConnectionError also covers APITimeoutError
+    RETRYABLE_EXCEPTIONS = (
+        anthropic.RateLimitError,
+        anthropic.APIConnectionError,
+        anthropic.InternalServerError,
+    )
+
     def __init__(self, api_key: str):
         """Initialize Anthropic provider with API key."""
-        self._client = anthropic.Anthropic(api_key=api_key)
+        # Retries happen in LLMClient, where backoff, Retry-After and the concurrency limiter see them
+        self._client = anthropic.Anthropic(api_key=api_key, max_retries=0)
+        self._api_key = api_key
+        # Created per event loop on first async use; see aclose
+        self._async_client: Optional[anthropic.AsyncAnthropic] = None
+
+    def _get_async_client(self) -> anthropic.AsyncAnthropic:
+        """Return the async client, opening a new connection pool after aclose."""
+        if self._async_client is None:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self._api_key, max_retries=0)
+        return self._async_client
 
-    def create_completion(self, prompt: str, model: str, max_tokens: int) -> Dict[str, Any]:
+    async def aclose(self) -> None:
+        """Close the async client's connection pool before its event loop ends."""
+        if self._async_client is not None:
+            async_client, self._async_client = self._async_client, None
+            await async_client.close()
+
+    def create_completion(
+        self, prompt: str, model: str, max_tokens: int, instructions: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a completion using Anthropic API."""
+        kwargs = {"system": instructions} if instructions else {}
         response = self._client.messages.create(
             model=model,
             max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
         )
         return {
             "text": response.content[0].text,
@@ -25,6 +64,27 @@ class AnthropicProvider(LLMProviderClient):
             "output_tokens": response.usage.output_tokens
         }
 
+    async def create_completion_async(
+        self, prompt: str, model: str, max_tokens: int, instructions: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a completion using the native async Anthropic client."""
+        kwargs = {"system": instructions} if instructions else {}
+        response = await self._get_async_client().messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
+        )
+        return {
+            "text": response.content[0].text,
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens
+        }
+
+    def max_output_tokens(self, model: str) -> Optional[int]:
+        """Largest max_tokens the SDK accepts for a non-streaming request to the model."""
+        return SLOW_MODEL_NONSTREAMING_OUTPUT_TOKENS.get(model, MAX_NONSTREAMING_OUTPUT_TOKENS)
+
     def is_available(self) -> bool:
         """Check if Anthropic client is available."""
         return self._client is not None
\ No newline at end of file
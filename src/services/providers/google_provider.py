@@ -1,20 +1,33 @@
 """Google provider implementation."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from . import LLMProviderClient
 
 
 class GoogleProvider(LLMProviderClient):
     """Google provider client implementation."""
 
+    RETRYABLE_EXCEPTIONS = (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+    )
+
     def __init__(self, api_key: str):
         """Initialize Google provider with API key."""
         genai.configure(api_key=api_key)
         self._client = genai.GenerativeModel()
 
-    def create_completion(self, prompt: str, model: str, max_tokens: int) -> Dict[str, Any]:
+    def create_completion(
+        self, prompt: str, model: str, max_tokens: int, instructions: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a completion using Google Gemini API."""
+        # Instructions go first so requests share a common prefix
+        if instructions:
+            prompt = f"{instructions}\n\n{prompt}"
+
         # Configure the model with the specified model name
         self._client = genai.GenerativeModel(model)
 
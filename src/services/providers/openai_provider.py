@@ -1,21 +1,70 @@
 """OpenAI provider implementation."""
 
-from typing import Dict, Any
-from openai import OpenAI
+import importlib.util
+import json
+import time
+from typing import Dict, Any, Optional
+import httpx
+from openai import (
+    APIConnectionError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
 from . import LLMProviderClient
 
 
+# Shared connection pool sized for concurrent per-file and per-directory requests
+CONNECTION_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+
+# HTTP/2 multiplexes requests over one connection but needs the optional h2 package
+HAS_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
 class OpenAIProvider(LLMProviderClient):
     """OpenAI provider client implementation."""
 
+    # APIConnectionError also covers APITimeoutError
+    RETRYABLE_EXCEPTIONS = (RateLimitError, APIConnectionError, InternalServerError)
+
     def __init__(self, api_key: str):
         """Initialize OpenAI provider with API key."""
-        self._client = OpenAI(api_key=api_key)
+        # Retries happen in LLMClient, where backoff, Retry-After and the concurrency limiter see them
+        self._client = OpenAI(
+            api_key=api_key,
+            max_retries=0,
+            http_client=DefaultHttpxClient(http2=HAS_HTTP2, limits=CONNECTION_LIMITS)
+        )
+        self._api_key = api_key
+        # Created per event loop on first async use; see aclose
+        self._async_client: Optional[AsyncOpenAI] = None
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Return the async client, opening a new connection pool after aclose."""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(http2=HAS_HTTP2, limits=CONNECTION_LIMITS)
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the async client's connection pool before its event loop ends."""
+        if self._async_client is not None:
+            async_client, self._async_client = self._async_client, None
+            await async_client.close()
 
-    def create_completion(self, prompt: str, model: str, max_tokens: int) -> Dict[str, Any]:
+    def create_completion(
+        self, prompt: str, model: str, max_tokens: int, instructions: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a completion using OpenAI API."""
         response = self._client.responses.create(
             model=model,
+            instructions=instructions,
             input=prompt,
             max_output_tokens=max_tokens,
             reasoning={"effort": "minimal"},
@@ -27,6 +76,103 @@ class OpenAIProvider(LLMProviderClient):
             "output_tokens": response.usage.output_tokens
         }
 
+    async def create_completion_async(
+        self, prompt: str, model: str, max_tokens: int, instructions: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a completion using the native async OpenAI client."""
+        response = await self._get_async_client().responses.create(
+            model=model,
+            instructions=instructions,
+            input=prompt,
+            max_output_tokens=max_tokens,
+            reasoning={"effort": "minimal"},
+            text={"verbosity": "low"}
+        )
+        return {
+            "text": response.output_text,
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens
+        }
+
+    def create_batch_completions(
+        self,
+        prompts: Dict[str, str],
+        model: str,
+        max_tokens: int,
+        instructions: Optional[str] = None,
+        poll_interval: float = 30.0
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Create completions through the OpenAI Batch API, blocking until the batch finishes.
+
+        Args:
+            prompts: Dictionary mapping a unique request id to its prompt
+            model: The model to use
+            max_tokens: Maximum number of output tokens per request
+            instructions: Static instructions shared by every request
+            poll_interval: Seconds to wait between batch status checks
+
+        Returns:
+            Dictionary mapping request id to a completion dict for every request
+            that succeeded
+        """
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": {
+                    "model": model,
+                    "instructions": instructions,
+                    "input": prompt,
+                    "max_output_tokens": max_tokens,
+                    "reasoning": {"effort": "minimal"},
+                    "text": {"verbosity": "low"}
+                }
+            })
+            for custom_id, prompt in prompts.items()
+        ]
+        batch_file = self._client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self._client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h"
+        )
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self._client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+
+        results = {}
+        for line in self._client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            body = response["body"]
+            text = "".join(
+                content.get("text", "")
+                for item in body.get("output", [])
+                if item.get("type") == "message"
+                for content in item.get("content", [])
+                if content.get("type") == "output_text"
+            )
+            usage = body.get("usage") or {}
+            results[record["custom_id"]] = {
+                "text": text,
+                "input_tokens": usage.get("input_tokens", 0),
+                "output_tokens": usage.get("output_tokens", 0)
+            }
+        return results
+
     def is_available(self) -> bool:
         """Check if OpenAI client is available."""
         return self._client is not None
\ No newline at end of file
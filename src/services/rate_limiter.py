@@ -0,0 +1,153 @@
+"""Proactive request pacing for LLM providers."""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """
+    Token-bucket limiter for requests per minute and tokens per minute.
+
+    Each bucket starts full, holds at most one minute's allowance and refills
+    continuously, so callers are paced to the provider's limits instead of
+    running into 429 responses and retry backoff.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        Initialize the limiter. A limit of None leaves that dimension unbounded.
+
+        Args:
+            requests_per_minute: Maximum requests started per minute
+            tokens_per_minute: Maximum estimated tokens sent per minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._available_requests = float(requests_per_minute or 0)
+        self._available_tokens = float(tokens_per_minute or 0)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the allowance accrued since the last refill, capped at one minute's worth."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._available_requests = min(
+                self.requests_per_minute, self._available_requests + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self._available_tokens = min(
+                self.tokens_per_minute, self._available_tokens + elapsed * self.tokens_per_minute / 60
+            )
+
+    def _seconds_until_available(self, tokens: int) -> float:
+        """Time to wait before one request of the given size fits in both buckets."""
+        wait = 0.0
+        if self.requests_per_minute and self._available_requests < 1:
+            wait = (1 - self._available_requests) * 60 / self.requests_per_minute
+        if self.tokens_per_minute and self._available_tokens < tokens:
+            wait = max(wait, (tokens - self._available_tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until a request of the given size is allowed, then consume its allowance.
+
+        Args:
+            tokens: Estimated tokens the request will send
+        """
+        if self.tokens_per_minute:
+            # A request larger than the bucket could never fit; let it through at a full bucket
+            tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = self._seconds_until_available(tokens)
+                if wait <= 0:
+                    break
+                logger.debug("Rate limit reached, waiting %.2fs", wait)
+                await asyncio.sleep(wait)
+            if self.requests_per_minute:
+                self._available_requests -= 1
+            if self.tokens_per_minute:
+                self._available_tokens -= tokens
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit for LLM requests that adapts to rate limiting (AIMD).
+
+    The limit starts at its maximum, halves when a request is rate limited and
+    grows by one after each window of `limit` requests completed without
+    being rate limited, so it settles just below the provider's real ceiling.
+    """
+
+    def __init__(self, max_limit: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_limit: Upper bound and starting value of the concurrency limit
+        """
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self._in_flight = 0
+        self._completed_in_window = 0
+        # Bumped on every decrease so one burst of 429s only halves the limit once
+        self._epoch = 0
+        self._waiters = []
+
+    async def acquire(self) -> int:
+        """
+        Wait for a free slot and take it.
+
+        Returns:
+            The current epoch, to be passed back to release
+        """
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+        return self._epoch
+
+    def release(self, epoch: int, rate_limited: bool = False, succeeded: bool = True) -> None:
+        """
+        Give a slot back and adjust the limit.
+
+        Only rate limiting lowers the limit and only successes raise it; other
+        failures (bad requests, timeouts) release the slot without adjusting it.
+
+        Args:
+            epoch: Value returned by the matching acquire
+            rate_limited: Whether the provider rejected the request for exceeding its rate limit
+            succeeded: Whether the request completed successfully
+        """
+        self._in_flight -= 1
+        if rate_limited:
+            # Requests started before the last decrease saw the old limit; don't punish it twice
+            if epoch == self._epoch:
+                self.limit = max(1, self.limit // 2)
+                self._epoch += 1
+                self._completed_in_window = 0
+                logger.info("Rate limited, reducing LLM concurrency to %d", self.limit)
+        elif succeeded:
+            self._completed_in_window += 1
+            if self._completed_in_window >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self._completed_in_window = 0
+        # Waiters re-check the limit themselves
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
@@ -8,6 +8,29 @@ from services.config import SemanticConfig
 
 logger = logging.getLogger(__name__)
 
+# Extensions (lowercase) that mark a file as source code
+SOURCE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx',  # Python and JavaScript
+    '.java', '.kt', '.scala',  # JVM languages
+    '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp',  # C/C++
+    '.rs',  # Rust
+    '.go',  # Go
+    '.rb',  # Ruby
+    '.php',  # PHP
+    '.cs',  # C#
+    '.swift',  # Swift
+    '.m', '.mm',  # Objective-C
+    '.r',  # R
+    '.sql',  # SQL
+    '.sh', '.bash',  # Shell scripts
+    '.ps1',  # PowerShell
+    '.yaml', '.yml', '.json', '.toml', '.ini', '.cfg',  # Configuration
+    '.md', '.rst',  # Documentation
+})
+
+# SOURCE_EXTENSIONS as a regex, for tools that filter files by pattern (e.g. pre-commit's `files`)
+SOURCE_FILES_PATTERN = r"(?i)\.(?:" + "|".join(sorted(ext[1:] for ext in SOURCE_EXTENSIONS)) + r")\Z"
+
 
 class TraversalEngine:
     """
@@ -67,23 +90,32 @@ class TraversalEngine:
             Path objects for directories that should have agents.md files generated
         """
         def _traverse(current_path: Path) -> Generator[Path, None, None]:
-            if not current_path.is_dir() or self.should_skip_directory(current_path):
+            if self.should_skip_directory(current_path):
                 return
-                
-            # Check if directory contains source files
-            has_source_files = self._has_source_files(current_path)
-            
+
+            # One listing per directory finds both its source files and its subdirectories
+            subdirectory_names = []
+            has_source_files = False
+            try:
+                with os.scandir(current_path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                subdirectory_names.append(entry.name)
+                            elif not has_source_files and entry.is_file():
+                                has_source_files = os.path.splitext(entry.name)[1].lower() in SOURCE_EXTENSIONS
+                        except OSError:
+                            continue
+            except (PermissionError, OSError):
+                # Skip directories we can't access (or paths that are not directories)
+                return
+
             if has_source_files:
                 yield current_path
                 
             # Recursively traverse subdirectories
-            try:
-                for item in sorted(current_path.iterdir()):
-                    if item.is_dir():
-                        yield from _traverse(item)
-            except (PermissionError, OSError):
-                # Skip directories we can't access
-                pass
+            for name in sorted(subdirectory_names):
+                yield from _traverse(current_path / name)
                 
         yield from _traverse(self.root_path)
         
@@ -97,36 +129,15 @@ class TraversalEngine:
         Returns:
             True if the directory contains source files, False otherwise
         """
-        source_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx',  # Python and JavaScript
-            '.java', '.kt', '.scala',  # JVM languages
-            '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp',  # C/C++
-            '.rs',  # Rust
-            '.go',  # Go
-            '.rb',  # Ruby
-            '.php',  # PHP
-            '.cs',  # C#
-            '.swift',  # Swift
-            '.m', '.mm',  # Objective-C
-            '.r', '.R',  # R
-            '.sql',  # SQL
-            '.sh', '.bash',  # Shell scripts
-            '.ps1',  # PowerShell
-            '.yaml', '.yml', '.json', '.toml', '.ini', '.cfg',  # Configuration
-            '.md', '.rst',  # Documentation
-        }
-        
         try:
             for item in directory.iterdir():
-                if item.is_file() and item.suffix.lower() in source_extensions:
+                if item.is_file() and item.suffix.lower() in SOURCE_EXTENSIONS:
                     return True
         except (PermissionError, OSError):
             pass
             
         return False
         
-
-        
     def _is_source_file(self, file_path: Path) -> bool:
         """
         Check if a file is considered a source code file.
@@ -137,15 +148,4 @@ class TraversalEngine:
         Returns:
             True if the file is a source file, False otherwise
         """
-        source_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx',
-            '.java', '.kt', '.scala',
-            '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp',
-            '.rs', '.go', '.rb', '.php', '.cs', '.swift',
-            '.m', '.mm', '.r', '.R', '.sql',
-            '.sh', '.bash', '.ps1',
-            '.yaml', '.yml', '.json', '.toml', '.ini', '.cfg',
-            '.md', '.rst',
-        }
-        
-        return file_path.suffix.lower() in source_extensions
\ No newline at end of file
+        return file_path.suffix.lower() in SOURCE_EXTENSIONS
@@ -2,6 +2,7 @@
 
 import subprocess
 import logging
+from functools import cached_property
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -28,6 +29,16 @@ class VcsInterface:
         """
         Get the current commit hash from the repository.
         
+        Returns:
+            The full SHA commit hash, or 'UNCOMMITTED' if not available
+        """
+        return self.current_commit_hash
+
+    @cached_property
+    def current_commit_hash(self) -> str:
+        """
+        Current commit hash, resolved with one git call per VcsInterface instance.
+
         Returns:
             The full SHA commit hash, or 'UNCOMMITTED' if not available
         """
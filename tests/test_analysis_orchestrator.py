@@ -0,0 +1,197 @@
+"""Unit tests for the analysis orchestrator."""
+
+import sys
+import os
+import asyncio
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services import analysis_orchestrator
+from services.analysis_orchestrator import AnalysisOrchestrator
+from models.data_models import ApiInfo
+
+
+class FakeLLMClient:
+    """Stand-in LLM client that records concurrency and returns one API per file."""
+
+    def __init__(self, delay: float = 0.01, omit_from_batch: str = None):
+        self.delay = delay
+        self.omit_from_batch = omit_from_batch
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.single_calls = 0
+        self.batch_calls = 0
+        self.manifest = {}
+        self.closed_loops = []
+
+    def is_available(self) -> bool:
+        return True
+
+    async def aclose(self):
+        self.closed_loops.append(asyncio.get_running_loop())
+
+    async def analyze_file_comprehensively_async(self, content: str, file_path: str):
+        self.single_calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return self._result(content, file_path)
+
+    async def analyze_files_batch_async(self, files):
+        self.batch_calls += 1
+        await asyncio.sleep(self.delay)
+        return {
+            file_path: self._result(content, file_path)
+            for file_path, content in files
+            if os.path.basename(file_path) != self.omit_from_batch
+        }
+
+    def get_unchanged_file_analysis(self, file_path: str, mtime_ns: int, size: int):
+        entry = self.manifest.get(file_path)
+        if entry and entry[:2] == (mtime_ns, size):
+            return entry[2]
+        return None
+
+    def record_file_analysis(self, file_path: str, mtime_ns: int, size: int, content: str):
+        self.manifest[file_path] = (mtime_ns, size, self._result(content, file_path))
+
+    def _result(self, content: str, file_path: str):
+        name = os.path.basename(file_path)
+        api = ApiInfo(name=name, semantic_description=content, source_file=file_path, start_line=1, end_line=1)
+        return [api], [name.rsplit('.', 1)[-1]]
+
+
+def _make_files(directory, count):
+    for i in range(count):
+        (directory / f"module_{i:02d}.py").write_text(f"content {i}", encoding='utf-8')
+
+
+def test_analyze_directory_runs_files_concurrently(tmp_path, monkeypatch):
+    """Test that per-file LLM calls overlap and respect the concurrency cap."""
+    fake = FakeLLMClient()
+    monkeypatch.setattr(analysis_orchestrator, "llm_client", fake)
+    _make_files(tmp_path, 10)
+
+    analysis = asyncio.run(AnalysisOrchestrator().analyze_directory_async(tmp_path, max_concurrency=4, batch_token_budget=0))
+
+    assert fake.max_in_flight == 4
+    assert len(analysis.apis) == 10
+    assert analysis.file_types == {'.py': 10}
+    assert analysis.required_skillsets == ['py']
+
+
+def test_analyze_directory_preserves_file_order(tmp_path, monkeypatch):
+    """Test that aggregated APIs are ordered by source file."""
+    monkeypatch.setattr(analysis_orchestrator, "llm_client", FakeLLMClient())
+    _make_files(tmp_path, 5)
+
+    analysis = AnalysisOrchestrator().analyze_directory(tmp_path)
+
+    assert [api.name for api in analysis.apis] == [f"module_{i:02d}.py" for i in range(5)]
+
+
+def test_small_files_are_batched(tmp_path, monkeypatch):
+    """Test that small files share a request and omitted files fall back to single requests."""
+    fake = FakeLLMClient(omit_from_batch="module_03.py")
+    monkeypatch.setattr(analysis_orchestrator, "llm_client", fake)
+    _make_files(tmp_path, 6)
+    (tmp_path / "large.py").write_text("x" * 40000, encoding='utf-8')
+
+    analysis = asyncio.run(AnalysisOrchestrator().analyze_directory_async(tmp_path, batch_token_budget=8000))
+
+    assert fake.batch_calls == 1
+    assert fake.single_calls == 2  # large.py plus the file omitted from the batch
+    assert len(analysis.apis) == 7
+
+
+def test_get_source_files_filters_entries(tmp_path):
+    """Test that only visible files with source extensions are returned, sorted."""
+    for name in ["b.py", "a.TS", ".hidden.py", "notes.txt", "Makefile", "trailing.", "package-lock.json"]:
+        (tmp_path / name).write_text("x", encoding='utf-8')
+    (tmp_path / "pkg.py").mkdir()
+
+    source_files = AnalysisOrchestrator()._get_source_files(tmp_path)
+
+    assert [p.name for p in source_files] == ["a.TS", "b.py"]
+
+
+def test_read_source_file_truncates_long_files(tmp_path):
+    """Test that only the first MAX_LLM_INPUT_BYTES bytes are read."""
+    file_path = tmp_path / "long.py"
+    file_path.write_text("a" * (analysis_orchestrator.MAX_LLM_INPUT_BYTES + 10), encoding='utf-8')
+
+    content = AnalysisOrchestrator()._read_source_file(file_path)
+
+    assert content == "a" * analysis_orchestrator.MAX_LLM_INPUT_BYTES + "\n\n[TRUNCATED]"
+
+
+def test_get_source_files_skips_oversized_files(tmp_path, monkeypatch):
+    """Test that files above MAX_FILE_BYTES are filtered during the scan."""
+    monkeypatch.setattr(analysis_orchestrator, "MAX_FILE_BYTES", 10)
+    (tmp_path / "small.py").write_text("x" * 10, encoding='utf-8')
+    (tmp_path / "large.py").write_text("x" * 11, encoding='utf-8')
+
+    source_files = AnalysisOrchestrator()._get_source_files(tmp_path)
+
+    assert [p.name for p in source_files] == ["small.py"]
+
+
+def test_unchanged_files_skip_analysis(tmp_path, monkeypatch):
+    """Test that files unchanged since the last run are not re-analyzed."""
+    fake = FakeLLMClient()
+    monkeypatch.setattr(analysis_orchestrator, "llm_client", fake)
+    _make_files(tmp_path, 3)
+    orchestrator = AnalysisOrchestrator()
+
+    asyncio.run(orchestrator.analyze_directory_async(tmp_path, batch_token_budget=0))
+    assert fake.single_calls == 3
+
+    (tmp_path / "module_01.py").write_text("changed content", encoding='utf-8')
+    analysis = asyncio.run(orchestrator.analyze_directory_async(tmp_path, batch_token_budget=0))
+
+    assert fake.single_calls == 4
+    assert len(analysis.apis) == 3
+
+
+def test_sync_analyze_directory_inside_running_loop(tmp_path, monkeypatch):
+    """Test that the sync wrapper still works when called from a coroutine."""
+    monkeypatch.setattr(analysis_orchestrator, "llm_client", FakeLLMClient())
+    _make_files(tmp_path, 3)
+
+    async def _call_sync():
+        return AnalysisOrchestrator().analyze_directory(tmp_path)
+
+    analysis = asyncio.run(_call_sync())
+
+    assert len(analysis.apis) == 3
+
+
+def test_sibling_directories_share_config(tmp_path, monkeypatch):
+    """Test that the .semanticsrc of a shared parent is loaded once per orchestrator."""
+    monkeypatch.setattr(analysis_orchestrator, "llm_client", FakeLLMClient())
+    loaded = []
+    real_config = analysis_orchestrator.SemanticConfig
+    monkeypatch.setattr(analysis_orchestrator, "SemanticConfig", lambda root: loaded.append(root) or real_config(root))
+    orchestrator = AnalysisOrchestrator()
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        _make_files(tmp_path / name, 1)
+        orchestrator.analyze_directory(tmp_path / name)
+
+    assert loaded == [tmp_path]
+
+
+def test_sync_analyze_directory_closes_connections_per_run(tmp_path, monkeypatch):
+    """Test that each sync call closes the LLM connections before its event loop ends."""
+    fake = FakeLLMClient()
+    monkeypatch.setattr(analysis_orchestrator, "llm_client", fake)
+    _make_files(tmp_path, 1)
+    orchestrator = AnalysisOrchestrator()
+
+    orchestrator.analyze_directory(tmp_path)
+    orchestrator.analyze_directory(tmp_path)
+
+    assert len(fake.closed_loops) == 2
+    assert fake.closed_loops[0] is not fake.closed_loops[1]
@@ -0,0 +1,71 @@
+"""Unit tests for the LLM response cache."""
+
+import sys
+import os
+import hashlib
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.llm_cache import LLMCache
+
+
+def test_cache_round_trip(tmp_path):
+    """Test that stored values are returned and persist across instances."""
+    cache = LLMCache(tmp_path / "llm.sqlite")
+    key = LLMCache.make_key("gpt-5-nano", "1", "print('hello')")
+
+    assert cache.get(key) is None
+    cache.set(key, '{"apis": [], "skillsets": ["Python"]}')
+    assert cache.get(key) == '{"apis": [], "skillsets": ["Python"]}'
+
+    reopened = LLMCache(tmp_path / "llm.sqlite")
+    assert reopened.get(key) == '{"apis": [], "skillsets": ["Python"]}'
+
+
+def test_cache_key_depends_on_every_part():
+    """Test that changing any key part changes the key."""
+    base = LLMCache.make_key("gpt-5-nano", "1", "content")
+    assert LLMCache.make_key("gpt-5", "1", "content") != base
+    assert LLMCache.make_key("gpt-5-nano", "2", "content") != base
+    assert LLMCache.make_key("gpt-5-nano", "1", "content!") != base
+    assert LLMCache.make_key("gpt-5-nano", "1", "content") == base
+
+
+def test_cache_key_is_stable():
+    """Test that keys stay the SHA-256 of the NUL-joined parts, so existing caches remain valid."""
+    parts = ("openai", "gpt-5-nano", "summary", "naïve ✓ content")
+
+    assert LLMCache.make_key(*parts) == hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def test_cache_bypass_env(tmp_path, monkeypatch):
+    """Test that SEMANTIC_NO_CACHE=1 disables reads and writes."""
+    monkeypatch.setenv("SEMANTIC_NO_CACHE", "1")
+    cache = LLMCache(tmp_path / "llm.sqlite")
+    cache.set("key", "value")
+    assert cache.get("key") is None
+    assert not (tmp_path / "llm.sqlite").exists()
+
+
+def test_cache_bypass_flag(tmp_path):
+    """Test that the disabled flag disables reads and writes."""
+    cache = LLMCache(tmp_path / "llm.sqlite")
+    cache.disabled = True
+    cache.set("key", "value")
+    assert cache.get("key") is None
+    assert not (tmp_path / "llm.sqlite").exists()
+
+
+def test_cache_refresh_skips_reads_but_stores(tmp_path):
+    """Test that refresh mode misses on lookups while still recording new responses."""
+    cache = LLMCache(tmp_path / "llm.sqlite")
+    cache.set("key", "old")
+    cache.set_manifest_entry("file", 1, 2, "key")
+    cache.refresh = True
+    assert cache.get("key") is None
+    assert cache.get_manifest_entry("file") is None
+    cache.set("key", "new")
+
+    cache.refresh = False
+    assert cache.get("key") == "new"
@@ -0,0 +1,290 @@
+"""Unit tests for the LLM client."""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services import llm_client as llm_client_module
+from services.llm_client import LLMClient
+from services.llm_cache import LLMCache
+from services.llm_usage_metrics import LLMProvider
+from services.rate_limiter import AdaptiveConcurrencyLimiter
+from services.providers import LLMProviderClient
+
+
+class TransientError(Exception):
+    """Stand-in for a provider rate-limit error."""
+
+    def __init__(self, message, retry_after=None, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+        if retry_after is not None:
+            self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+
+class FlakyProvider(LLMProviderClient):
+    """Provider that fails a fixed number of times before succeeding."""
+
+    RETRYABLE_EXCEPTIONS = (TransientError,)
+
+    def __init__(self, failures: int, status_code: int = None):
+        self.failures = failures
+        self.status_code = status_code
+        self.calls = 0
+
+    def create_completion(self, prompt, model, max_tokens, instructions=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TransientError("rate limited", status_code=self.status_code)
+        return {"text": "ok", "input_tokens": 1, "output_tokens": 1}
+
+    def is_available(self) -> bool:
+        return True
+
+
+def _client_with_provider(provider: LLMProviderClient) -> LLMClient:
+    client = LLMClient()
+    client.api_key = "test-key"
+    client.__dict__["_provider_client"] = provider
+    return client
+
+
+@pytest.fixture(autouse=True)
+def no_retry_wait(monkeypatch):
+    monkeypatch.setattr(llm_client_module, "RETRY_MIN_WAIT", 0.0)
+    monkeypatch.setattr(llm_client_module, "RETRY_MAX_WAIT", 0.0)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    cache = LLMCache(tmp_path / "llm.sqlite")
+    monkeypatch.setattr(llm_client_module, "llm_cache", cache)
+    return cache
+
+
+def test_transient_errors_are_retried():
+    """Test that retryable errors are retried until the call succeeds."""
+    provider = FlakyProvider(failures=2)
+    client = _client_with_provider(provider)
+
+    assert client.summarize("prompt") == "ok"
+    assert provider.calls == 3
+
+
+def test_async_transient_errors_are_retried():
+    """Test that the async path retries through the default thread-based fallback."""
+    provider = FlakyProvider(failures=1)
+    client = _client_with_provider(provider)
+
+    assert asyncio.run(client.summarize_async("prompt")) == "ok"
+    assert provider.calls == 2
+
+
+def test_rate_limit_errors_shrink_concurrency():
+    """Test that a 429 halves the adaptive concurrency limit and frees its slot."""
+    client = _client_with_provider(FlakyProvider(failures=1, status_code=429))
+    client.concurrency_limiter = AdaptiveConcurrencyLimiter(4)
+
+    assert asyncio.run(client.summarize_async("prompt")) == "ok"
+    assert client.concurrency_limiter.limit == 2
+    assert client.concurrency_limiter._in_flight == 0
+
+
+class RejectingProvider(FlakyProvider):
+    """Provider that rejects every request with a non-retryable error."""
+
+    def create_completion(self, prompt, model, max_tokens, instructions=None):
+        self.calls += 1
+        raise ValueError("bad request")
+
+
+def test_non_retryable_errors_do_not_grow_concurrency():
+    """Test that failed requests free their slot without counting towards a limit increase."""
+    client = _client_with_provider(RejectingProvider(failures=0))
+    client.concurrency_limiter = AdaptiveConcurrencyLimiter(4)
+    client.concurrency_limiter.limit = 1
+
+    for i in range(3):
+        with pytest.raises(ValueError):
+            asyncio.run(client.summarize_async(f"prompt {i}"))
+
+    assert client.concurrency_limiter.limit == 1
+    assert client.concurrency_limiter._in_flight == 0
+
+
+def test_retries_give_up_after_max_attempts():
+    """Test that the last transient error is raised once attempts run out."""
+    provider = FlakyProvider(failures=100)
+    client = _client_with_provider(provider)
+
+    with pytest.raises(TransientError):
+        client.summarize("prompt")
+    assert provider.calls == llm_client_module.MAX_RETRY_ATTEMPTS
+
+
+def test_parse_json_response_handles_fences_and_garbage():
+    """Test that fenced JSON is parsed and invalid JSON yields None."""
+    client = LLMClient()
+
+    assert client._parse_json_response('```json\n{"apis": []}\n```', "test") == {"apis": []}
+    assert client._parse_json_response("not json", "test") is None
+
+
+def test_summaries_are_served_from_cache():
+    """Test that repeating a summary prompt does not call the provider again."""
+    provider = FlakyProvider(failures=0)
+    client = _client_with_provider(provider)
+
+    assert client.summarize("prompt") == "ok"
+    assert asyncio.run(client.summarize_async("prompt")) == "ok"
+    assert provider.calls == 1
+
+    assert client.summarize("other prompt") == "ok"
+    assert provider.calls == 2
+
+    assert client.summarize("prompt  \t") == "ok"
+    assert provider.calls == 2
+
+
+def test_concurrent_identical_summaries_share_one_request():
+    """Test that identical prompts in flight at the same time make a single provider call."""
+    provider = FlakyProvider(failures=0)
+    client = _client_with_provider(provider)
+
+    async def _summarize_twice():
+        return await asyncio.gather(client.summarize_async("prompt"), client.summarize_async("prompt"))
+
+    assert asyncio.run(_summarize_twice()) == ["ok", "ok"]
+    assert provider.calls == 1
+    assert client._summaries_in_flight == {}
+
+
+def test_unchanged_directory_summary_is_reused():
+    """Test that a recorded fingerprint returns its summary without calling the provider."""
+    provider = FlakyProvider(failures=0)
+    client = _client_with_provider(provider)
+
+    assert client.get_unchanged_summary("fingerprint") is None
+    client.summarize("prompt")
+    client.record_summary("fingerprint", "prompt")
+
+    assert client.get_unchanged_summary("fingerprint") == "ok"
+    assert client.get_unchanged_summary("other fingerprint") is None
+    assert provider.calls == 1
+
+
+def test_stored_group_summary_serves_single_prompt():
+    """Test that a summary split from a grouped response is cached under its own prompt."""
+    provider = FlakyProvider(failures=0)
+    client = _client_with_provider(provider)
+
+    assert client.lookup_summary("prompt") is None
+    client.store_summary("prompt", "grouped summary")
+
+    assert client.lookup_summary("prompt") == "grouped summary"
+    assert client.summarize("prompt") == "grouped summary"
+    assert provider.calls == 0
+
+
+def test_file_analysis_cache_keys_are_scoped_to_provider():
+    """Test that the same model name under another provider never shares file analyses."""
+    openai_client = LLMClient(LLMProvider.OPENAI, model="shared-model")
+    anthropic_client = LLMClient(LLMProvider.ANTHROPIC, model="shared-model")
+
+    assert openai_client._file_analysis_cache_key("x = 1") != anthropic_client._file_analysis_cache_key("x = 1")
+    assert openai_client._manifest_key("a.py") != anthropic_client._manifest_key("a.py")
+
+
+class CappedProvider(FlakyProvider):
+    """Provider that accepts at most 8192 output tokens per request and records what it was asked for."""
+
+    def __init__(self):
+        super().__init__(failures=0)
+        self.max_tokens = []
+
+    def create_completion(self, prompt, model, max_tokens, instructions=None):
+        self.max_tokens.append(max_tokens)
+        return super().create_completion(prompt, model, max_tokens, instructions)
+
+    def max_output_tokens(self, model):
+        return 8192
+
+
+def test_grouped_requests_respect_provider_output_ceiling():
+    """Test that combined requests ask for no more output tokens than the provider accepts."""
+    provider = CappedProvider()
+    client = _client_with_provider(provider)
+
+    asyncio.run(client.summarize_group_async("prompt", 5))
+    client.analyze_files_batch([("a.py", "x = 1"), ("b.py", "y = 2")])
+
+    assert provider.max_tokens == [8192, 8192]
+
+
+class BatchProvider(FlakyProvider):
+    """Provider with a Batch API that drops one request."""
+
+    def __init__(self, drop: str = None):
+        super().__init__(failures=0)
+        self.drop = drop
+        self.batches = []
+
+    def create_batch_completions(self, prompts, model, max_tokens, instructions=None):
+        self.batches.append(dict(prompts))
+        return {
+            custom_id: {"text": f"summary of {prompt}", "input_tokens": 1, "output_tokens": 1}
+            for custom_id, prompt in prompts.items()
+            if custom_id != self.drop
+        }
+
+
+def test_summarize_as_batch_submits_only_uncached_prompts():
+    """Test that cached summaries are reused and failed batch requests yield None."""
+    provider = BatchProvider(drop="summary-2")
+    client = _client_with_provider(provider)
+    client.summarize("a")
+
+    summaries = client.summarize_as_batch(["a", "b", "c"])
+
+    assert summaries == ["ok", "summary of b", None]
+    assert provider.batches == [{"summary-1": "b", "summary-2": "c"}]
+    assert client.summarize_as_batch(["b"]) == ["summary of b"]
+    assert len(provider.batches) == 1
+
+
+def test_retry_honors_retry_after_header(monkeypatch):
+    """Test that a provider's Retry-After delay is honored, even beyond RETRY_MAX_WAIT."""
+    monkeypatch.setattr(llm_client_module, "RETRY_MAX_WAIT", 10.0)
+    client = LLMClient()
+
+    assert client._before_retry("summary", 1, TransientError("rate limited", retry_after="5")) == 5.0
+    assert client._before_retry("summary", 1, TransientError("rate limited", retry_after="60")) == 60.0
+    assert client._before_retry("summary", 1, TransientError("rate limited", retry_after="soon")) <= 2.0
+
+
+@pytest.mark.parametrize("use_dotenv", [False, True])
+def test_env_file_does_not_override_environment(tmp_path, monkeypatch, use_dotenv):
+    """Test that both .env loaders read quoted values and keep variables already set."""
+    if use_dotenv:
+        pytest.importorskip("dotenv")
+    monkeypatch.setattr(llm_client_module, "HAS_DOTENV", use_dotenv)
+    (tmp_path / ".env").write_text('# comment\nSEMANTIC_TEST_NEW="from file"\nSEMANTIC_TEST_SET=from file\n', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    # setenv first so monkeypatch removes the variable the loader sets again on teardown
+    monkeypatch.setenv("SEMANTIC_TEST_NEW", "")
+    monkeypatch.delenv("SEMANTIC_TEST_NEW")
+    monkeypatch.setenv("SEMANTIC_TEST_SET", "exported")
+    llm_client_module._load_env_file.cache_clear()
+    try:
+        llm_client_module._load_env_file()
+    finally:
+        llm_client_module._load_env_file.cache_clear()
+
+    assert os.environ["SEMANTIC_TEST_NEW"] == "from file"
+    assert os.environ["SEMANTIC_TEST_SET"] == "exported"
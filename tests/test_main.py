@@ -0,0 +1,319 @@
+"""Unit tests for CLI helpers."""
+
+import sys
+import os
+import time
+import asyncio
+import logging
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from codebase_summarizer import main
+from codebase_summarizer.main import _directory_fingerprint, _write_output_file
+from services import analysis_orchestrator
+from services.analysis_orchestrator import AnalysisOrchestrator
+from services.config import SemanticConfig
+
+
+class FakeTraversalEngine:
+    """Stand-in traversal engine returning a fixed list of directories."""
+
+    def __init__(self, root_path, directories):
+        self.root_path = root_path
+        self.config = SemanticConfig(root_path)
+        self.directories = directories
+
+    def get_directories_to_process(self):
+        yield from self.directories
+
+
+class FakeSummaryClient:
+    """Stand-in LLM client that records how many summaries run at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts = []
+        self.closed_loops = []
+
+    def get_unchanged_summary(self, fingerprint):
+        return None
+
+    def record_summary(self, fingerprint, prompt):
+        pass
+
+    async def summarize_async(self, prompt):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return "summary"
+
+    def lookup_summary(self, prompt):
+        return None
+
+    def store_summary(self, prompt, summary):
+        pass
+
+    async def aclose(self):
+        self.closed_loops.append(asyncio.get_running_loop())
+
+
+class FakeGroupSummaryClient(FakeSummaryClient):
+    """Stand-in LLM client answering grouped prompts, leaving out one directory."""
+
+    def __init__(self, omit_label=None):
+        super().__init__()
+        self.omit_label = omit_label
+        self.group_calls = 0
+        self.single_calls = 0
+
+    async def summarize_group_async(self, prompt, directory_count):
+        self.group_calls += 1
+        labels = main._GROUP_MARKER_RE.findall(prompt)
+        assert len(labels) == directory_count
+        return "\n".join(f"<<<DIR path={label}>>>\nsummary of {label}" for label in labels if label != self.omit_label)
+
+    async def summarize_async(self, prompt):
+        self.single_calls += 1
+        return "single summary"
+
+
+def test_write_output_file_replaces_content(tmp_path):
+    """Test that summaries are written atomically without leaving temp files."""
+    output_file = tmp_path / "agents.md"
+    output_file.write_text("old summary", encoding='utf-8')
+
+    _write_output_file(output_file, "## Required Skillsets\n- Python ✓\n")
+
+    assert output_file.read_text(encoding='utf-8') == "## Required Skillsets\n- Python ✓\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["agents.md"]
+
+
+def test_write_output_file_skips_identical_content(tmp_path):
+    """Test that rewriting the same summary only touches the existing file."""
+    output_file = tmp_path / "agents.md"
+    output_file.write_text("summary", encoding='utf-8')
+    os.utime(output_file, ns=(1, 1))
+    inode = output_file.stat().st_ino
+
+    _write_output_file(output_file, "summary")
+
+    assert output_file.stat().st_ino == inode
+    assert output_file.stat().st_mtime_ns > 1
+
+
+def test_directory_fingerprint_tracks_file_changes(tmp_path):
+    """Test that the fingerprint changes when a source file changes."""
+    source_file = tmp_path / "module.py"
+    source_file.write_text("x = 1", encoding='utf-8')
+
+    before = _directory_fingerprint([(source_file, source_file.stat())], tmp_path, tmp_path)
+    assert _directory_fingerprint([(source_file, source_file.stat())], tmp_path, tmp_path) == before
+
+    source_file.write_text("x = 12", encoding='utf-8')
+    assert _directory_fingerprint([(source_file, source_file.stat())], tmp_path, tmp_path) != before
+
+
+def test_directory_fingerprint_is_scoped_to_directory(tmp_path):
+    """Test that identical-looking files in different directories get different fingerprints."""
+    stats = []
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        source_file = tmp_path / name / "mod.py"
+        source_file.write_text(name.upper() * 4, encoding='utf-8')
+        os.utime(source_file, ns=(1, 1))
+        stats.append([(source_file, source_file.stat())])
+
+    assert (_directory_fingerprint(stats[0], tmp_path / "a", tmp_path)
+            != _directory_fingerprint(stats[1], tmp_path / "b", tmp_path))
+    # The same relative directory in another project is not shared either
+    assert (_directory_fingerprint(stats[0], tmp_path / "a", tmp_path)
+            != _directory_fingerprint(stats[0], tmp_path / "b" / "a", tmp_path / "b"))
+
+
+def test_directories_processed_by_bounded_workers(tmp_path, monkeypatch):
+    """Test that every directory is summarized with at most max_concurrent in flight."""
+    directories = []
+    for i in range(6):
+        directory = tmp_path / f"pkg_{i}"
+        directory.mkdir()
+        (directory / "module.py").write_text(f"x = {i}", encoding='utf-8')
+        directories.append(directory)
+    fake = FakeSummaryClient()
+    monkeypatch.setattr(main, "llm_client", fake)
+
+    processed = asyncio.run(main._process_directories_async(
+        FakeTraversalEngine(tmp_path, directories), AnalysisOrchestrator(), logging.getLogger(__name__),
+        force=False, max_concurrent=2, summary_group_budget=0
+    ))
+
+    assert processed == 6
+    assert fake.max_in_flight == 2
+    assert all((directory / "agents.md").read_text(encoding='utf-8') == "summary" for directory in directories)
+
+
+def test_directory_processing_closes_connections_before_loop_ends(tmp_path, monkeypatch):
+    """Test that the run closes the LLM client's connections on its own event loop."""
+    directory = tmp_path / "pkg"
+    directory.mkdir()
+    (directory / "module.py").write_text("x = 1", encoding='utf-8')
+    fake = FakeSummaryClient()
+    monkeypatch.setattr(main, "llm_client", fake)
+    run_loops = []
+
+    async def _run():
+        run_loops.append(asyncio.get_running_loop())
+        return await main._process_directories_async(
+            FakeTraversalEngine(tmp_path, [directory]), AnalysisOrchestrator(), logging.getLogger(__name__), force=False
+        )
+
+    assert asyncio.run(_run()) == 1
+    assert fake.closed_loops == run_loops
+
+
+def test_collect_file_contents_formats_sections(tmp_path):
+    """Test that file contents are wrapped in fenced markdown sections, keeping files with bad bytes."""
+    (tmp_path / "a.py").write_text("x = 1", encoding='utf-8')
+    (tmp_path / "b.go").write_bytes(b"ok\xff\r\n")
+    files = [tmp_path / "a.py", tmp_path / "b.go", tmp_path / "missing.rs"]
+
+    contents = asyncio.run(main._collect_file_contents(files, logging.getLogger(__name__)))
+
+    assert contents.startswith(
+        "\n### File: a.py\n```py\nx = 1\n```\n"
+        "\n### File: b.go\n```go\nok\ufffd\r\n\n```\n"
+        "\n### File: missing.rs\n[Error reading file: "
+    )
+
+
+def test_small_directories_are_summarized_in_groups(tmp_path, monkeypatch):
+    """Test that small directories share requests and omitted ones fall back to single requests."""
+    directories = []
+    for i in range(7):
+        directory = tmp_path / f"pkg_{i}"
+        directory.mkdir()
+        (directory / "module.py").write_text(f"x = {i}", encoding='utf-8')
+        directories.append(directory)
+    fake = FakeGroupSummaryClient(omit_label="pkg_3")
+    monkeypatch.setattr(main, "llm_client", fake)
+
+    processed = asyncio.run(main._process_directories_async(
+        FakeTraversalEngine(tmp_path, directories), AnalysisOrchestrator(), logging.getLogger(__name__), force=False
+    ))
+
+    assert processed == 7
+    assert fake.group_calls == 2  # groups of SUMMARY_GROUP_MAX_DIRECTORIES and 2
+    assert fake.single_calls == 1
+    assert (directories[0] / "agents.md").read_text(encoding='utf-8') == "summary of pkg_0"
+    assert (directories[3] / "agents.md").read_text(encoding='utf-8') == "single summary"
+
+
+def test_full_groups_are_summarized_during_traversal(tmp_path, monkeypatch):
+    """Test that a full group of small directories doesn't wait for the traversal to finish."""
+    directories = []
+    for i in range(main.SUMMARY_GROUP_MAX_DIRECTORIES + 1):
+        directory = tmp_path / f"pkg_{i}"
+        directory.mkdir()
+        (directory / "module.py").write_text(f"x = {i}", encoding='utf-8')
+        directories.append(directory)
+    fake = FakeGroupSummaryClient()
+    monkeypatch.setattr(main, "llm_client", fake)
+    calls_before_last = []
+
+    class SlowTraversalEngine(FakeTraversalEngine):
+        def get_directories_to_process(self):
+            yield from self.directories[:-1]
+            # Runs in the producer thread; give the workers time to fill and send the first group
+            deadline = time.monotonic() + 5
+            while fake.group_calls == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            calls_before_last.append(fake.group_calls)
+            yield self.directories[-1]
+
+    processed = asyncio.run(main._process_directories_async(
+        SlowTraversalEngine(tmp_path, directories), AnalysisOrchestrator(), logging.getLogger(__name__), force=False
+    ))
+
+    assert processed == len(directories)
+    assert calls_before_last == [1]
+    assert fake.single_calls == 1  # the leftover directory is summarized on its own
+
+
+def test_read_prompt_file_truncates_long_files(tmp_path, monkeypatch):
+    """Test that summary prompts share the byte cap, without splitting a character or decoding past it."""
+    monkeypatch.setattr(analysis_orchestrator, "MAX_LLM_INPUT_BYTES", 4)
+    (tmp_path / "short.py").write_text("abcd", encoding='utf-8')
+    (tmp_path / "long.py").write_bytes("abcé".encode('utf-8') + b"\xff" * 100)
+
+    assert main._read_prompt_file(tmp_path / "short.py") == ("abcd", None)
+    assert main._read_prompt_file(tmp_path / "long.py") == ("abc\n\n[TRUNCATED]", None)
+
+
+def test_existing_summaries_are_skipped_without_force(tmp_path, monkeypatch):
+    """Test that directories with a summary are skipped before any worker runs."""
+    directories = []
+    for i in range(3):
+        directory = tmp_path / f"pkg_{i}"
+        directory.mkdir()
+        (directory / "module.py").write_text(f"x = {i}", encoding='utf-8')
+        directories.append(directory)
+    (directories[1] / "agents.md").write_text("existing", encoding='utf-8')
+    monkeypatch.setattr(main, "llm_client", FakeSummaryClient())
+
+    processed = asyncio.run(main._process_directories_async(
+        FakeTraversalEngine(tmp_path, directories), AnalysisOrchestrator(), logging.getLogger(__name__), force=False
+    ))
+
+    assert processed == 2
+    assert (directories[1] / "agents.md").read_text(encoding='utf-8') == "existing"
+
+
+def test_stale_summaries_are_regenerated_without_force(tmp_path, monkeypatch):
+    """Test that a summary older than its sources is regenerated, without feeding it back in."""
+    directory = tmp_path / "pkg"
+    directory.mkdir()
+    (directory / "module.py").write_text("x = 1", encoding='utf-8')
+    (directory / "agents.md").write_text("stale", encoding='utf-8')
+    os.utime(directory / "agents.md", ns=(1, 1))
+    fake = FakeSummaryClient()
+    monkeypatch.setattr(main, "llm_client", fake)
+
+    def _run():
+        return asyncio.run(main._process_directories_async(
+            FakeTraversalEngine(tmp_path, [directory]), AnalysisOrchestrator(), logging.getLogger(__name__),
+            force=False, summary_group_budget=0
+        ))
+
+    assert _run() == 1
+    assert (directory / "agents.md").read_text(encoding='utf-8') == "summary"
+    assert "### File: agents.md" not in fake.prompts[0]
+
+    # An unchanged regeneration still marks the summary fresh, so the next run skips it
+    os.utime(directory / "agents.md", ns=(1, 1))
+    assert _run() == 1
+    assert _run() == 0
+
+
+def test_stale_directory_is_scanned_once(tmp_path, monkeypatch):
+    """Test that the worker reuses the scan made by the freshness check."""
+    directory = tmp_path / "pkg"
+    directory.mkdir()
+    (directory / "module.py").write_text("x = 1", encoding='utf-8')
+    (directory / "agents.md").write_text("stale", encoding='utf-8')
+    os.utime(directory / "agents.md", ns=(1, 1))
+    monkeypatch.setattr(main, "llm_client", FakeSummaryClient())
+    orchestrator = AnalysisOrchestrator()
+    scans = []
+    scan_source_files = orchestrator._scan_source_files
+    monkeypatch.setattr(orchestrator, "_scan_source_files", lambda *args: scans.append(args) or scan_source_files(*args))
+
+    processed = asyncio.run(main._process_directories_async(
+        FakeTraversalEngine(tmp_path, [directory]), orchestrator, logging.getLogger(__name__),
+        force=False, summary_group_budget=0
+    ))
+
+    assert processed == 1
+    assert len(scans) == 1
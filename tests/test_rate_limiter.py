@@ -0,0 +1,105 @@
+"""Unit tests for the LLM request rate limiter."""
+
+import sys
+import os
+import asyncio
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services import rate_limiter
+from services.rate_limiter import AsyncTokenBucket, AdaptiveConcurrencyLimiter
+
+
+class FakeClock:
+    """Monotonic clock that only advances when the limiter sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _patch_clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def test_requests_are_paced_after_burst(monkeypatch):
+    """Test that a full bucket allows a burst and then paces at the refill rate."""
+    clock = _patch_clock(monkeypatch)
+    bucket = AsyncTokenBucket(requests_per_minute=60)
+
+    async def _acquire_many():
+        for _ in range(62):
+            await bucket.acquire()
+
+    asyncio.run(_acquire_many())
+
+    assert clock.sleeps == [1.0, 1.0]
+
+
+def test_token_limit_waits_for_refill(monkeypatch):
+    """Test that a request waits until enough tokens have refilled."""
+    clock = _patch_clock(monkeypatch)
+    bucket = AsyncTokenBucket(tokens_per_minute=600)
+
+    async def _acquire():
+        await bucket.acquire(500)
+        await bucket.acquire(200)
+
+    asyncio.run(_acquire())
+
+    assert clock.sleeps == [10.0]
+
+
+def test_concurrency_limit_halves_once_per_burst_and_recovers():
+    """Test multiplicative decrease on 429s and additive increase after a clean window."""
+    limiter = AdaptiveConcurrencyLimiter(8)
+
+    async def _run():
+        epochs = [await limiter.acquire() for _ in range(8)]
+        limiter.release(epochs[0], rate_limited=True)
+        limiter.release(epochs[1], rate_limited=True)  # same burst, no second decrease
+        assert limiter.limit == 4
+        for epoch in epochs[2:]:  # a window of 4 clean completions raises the limit by one
+            limiter.release(epoch)
+        assert limiter.limit == 5
+
+    asyncio.run(_run())
+
+
+def test_concurrency_limit_blocks_until_release():
+    """Test that acquire waits while the limit is reached."""
+    limiter = AdaptiveConcurrencyLimiter(1)
+
+    async def _run():
+        epoch = await limiter.acquire()
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        limiter.release(epoch)
+        await asyncio.wait_for(waiting, 1)
+
+    asyncio.run(_run())
+
+
+def test_concurrency_limit_ignores_failures():
+    """Test that failed requests neither lower nor raise the limit."""
+    limiter = AdaptiveConcurrencyLimiter(4)
+    limiter.limit = 2
+
+    async def _run():
+        for _ in range(4):
+            limiter.release(await limiter.acquire(), succeeded=False)
+        assert limiter.limit == 2
+
+    asyncio.run(_run())
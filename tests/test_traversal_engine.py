@@ -0,0 +1,33 @@
+"""Unit tests for the traversal engine."""
+
+import sys
+import os
+import re
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.traversal_engine import TraversalEngine, SOURCE_EXTENSIONS, SOURCE_FILES_PATTERN
+
+
+def test_get_directories_to_process_walks_depth_first(tmp_path):
+    """Test that only directories with source files are yielded, in sorted depth-first order."""
+    for relative in ["main.py", "b/lib.GO", "a/notes.txt", "a/inner/util.rs", "node_modules/pkg/index.js", ".cache/x.py"]:
+        file_path = tmp_path / relative
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("x", encoding='utf-8')
+    (tmp_path / "a" / "empty").mkdir()
+
+    directories = list(TraversalEngine(tmp_path).get_directories_to_process())
+
+    assert directories == [tmp_path, tmp_path / "a" / "inner", tmp_path / "b"]
+
+
+def test_source_files_pattern_matches_source_extensions():
+    """Test that the hook pattern matches exactly the traversal's source extensions."""
+    pattern = re.compile(SOURCE_FILES_PATTERN)
+
+    assert all(pattern.search(f"src/module{ext}") for ext in SOURCE_EXTENSIONS)
+    assert pattern.search("analysis/model.R")
+    assert not pattern.search("module.pyc")
+    assert not pattern.search("notes.txt")
@@ -0,0 +1,28 @@
+"""Unit tests for the VCS interface."""
+
+import sys
+import os
+import subprocess
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services import vcs_interface
+from services.vcs_interface import VcsInterface
+
+
+def test_commit_hash_is_resolved_once(tmp_path, monkeypatch):
+    """Test that repeated commit hash lookups run git only once per instance."""
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout="abc1234def\n", stderr="")
+
+    monkeypatch.setattr(vcs_interface.subprocess, "run", fake_run)
+    vcs = VcsInterface(tmp_path)
+
+    assert vcs.get_current_commit_hash() == "abc1234def"
+    assert vcs.get_short_commit_hash() == "abc1234"
+    assert vcs.current_commit_hash == "abc1234def"
+    assert len(calls) == 1